@@ -1,5 +1,9 @@
-import random
 import math
+import secrets
+
+def _randint(lo, hi):
+    """Uniform integer in [lo, hi] from the OS CSPRNG, so forked signers never share draws."""
+    return lo + secrets.randbelow(hi - lo + 1)
 
 def generate_commitment(secret_data, public_params):
     """
@@ -10,17 +14,17 @@ def generate_commitment(secret_data, public_params):
     """
     n = public_params['n']
     # Example: generate random secrets and hyperbola params
-    s = random.randint(2, n-2)
-    r = random.randint(2, n-2)
-    h = random.randint(1, n-1)
-    k = random.randint(1, n-1)
-    a = random.randint(2, n//4)
-    b = random.randint(2, n//4)
+    s = _randint(2, n-2)
+    r = _randint(2, n-2)
+    h = _randint(1, n-1)
+    k = _randint(1, n-1)
+    a = _randint(2, n//4)
+    b = _randint(2, n//4)
     # For Fiat-Shamir, x = y^2 mod n
     y = s
     x = pow(y, 2, n)
     # For challenge 11, v is a public value
-    v = public_params.get('v', random.randint(2, n-2))
+    v = public_params.get('v', _randint(2, n-2))
     return {'x': x, 'y': y, 'h': h, 'k': k, 'a': a, 'b': b, 'r': r, 's': s, 'v': v}
 
 def generate_commitment_for_challenge(challenge, public_params):
@@ -30,58 +34,54 @@ def generate_commitment_for_challenge(challenge, public_params):
     """
     n = public_params['n']
     if challenge == '00':
-        y = random.randint(2, n-2)
+        y = _randint(2, n-2)
         x = pow(y, 2, n)
-        h = random.randint(1, n-1)
-        k = random.randint(1, n-1)
-        a = random.randint(2, n//4)
-        b = random.randint(2, n//4)
-        r = random.randint(2, n-2)
-        s = random.randint(2, n-2)
-        v = public_params.get('v', random.randint(2, n-2))
+        h = _randint(1, n-1)
+        k = _randint(1, n-1)
+        a = _randint(2, n//4)
+        b = _randint(2, n//4)
+        r = _randint(2, n-2)
+        s = _randint(2, n-2)
+        v = public_params.get('v', _randint(2, n-2))
         return {'x': x, 'y': y, 'h': h, 'k': k, 'a': a, 'b': b, 'r': r, 's': s, 'v': v}
     elif challenge == '01':
-        h = random.randint(1, n-1)
-        k = random.randint(1, n-1)
-        a = random.randint(2, n//4)
-        b = random.randint(2, n//4)
-        lower = h + a + 1
-        upper = n - 1
-        if lower > upper:
-            lower = upper
-        x = random.randint(lower, upper)
+        a = _randint(2, n//4)
+        b = _randint(2, n//4)
+        # Draw h only from centres that leave room for x >= h + a + 1 below n,
+        # so the x range is never empty and the sqrt argument is never negative
+        h = _randint(1, n - a - 2)
+        k = _randint(1, n-1)
+        x = _randint(h + a + 1, n - 1)
         y_val = math.sqrt((x-h)**2 / a**2 - 1) * b + k
         y = int(round(y_val))
-        r = random.randint(2, n-2)
-        s = random.randint(2, n-2)
-        v = public_params.get('v', random.randint(2, n-2))
+        r = _randint(2, n-2)
+        s = _randint(2, n-2)
+        v = public_params.get('v', _randint(2, n-2))
         return {'x': x, 'y': y, 'h': h, 'k': k, 'a': a, 'b': b, 'r': r, 's': s, 'v': v}
     elif challenge == '10':
-        h = random.randint(1, n-1)
-        k = random.randint(1, n-1)
-        a = random.randint(2, n//4)
-        b = random.randint(2, n//4)
-        lower = k + b + 1
-        upper = n - 1
-        if lower > upper:
-            lower = upper
-        y = random.randint(lower, upper)
+        a = _randint(2, n//4)
+        b = _randint(2, n//4)
+        h = _randint(1, n-1)
+        # Same for k: y >= k + b + 1 must stay below n
+        k = _randint(1, n - b - 2)
+        y = _randint(k + b + 1, n - 1)
         x_val = h + math.sqrt((y-k)**2 / b**2 - 1) * a
         x = int(round(x_val))
-        r = random.randint(2, n-2)
-        s = random.randint(2, n-2)
-        v = public_params.get('v', random.randint(2, n-2))
+        r = _randint(2, n-2)
+        s = _randint(2, n-2)
+        v = public_params.get('v', _randint(2, n-2))
         return {'x': x, 'y': y, 'h': h, 'k': k, 'a': a, 'b': b, 'r': r, 's': s, 'v': v}
     elif challenge == '11':
-        r = random.randint(2, n-2)
-        s = random.randint(2, n-2)
+        r = _randint(2, n-2)
+        s = _randint(2, n-2)
         y = (r * s) % n
-        x = random.randint(2, n-2)
-        h = random.randint(1, n-1)
-        k = random.randint(1, n-1)
-        a = random.randint(2, n//4)
-        b = random.randint(2, n//4)
-        v = public_params.get('v', random.randint(2, n-2))
+        h = _randint(1, n-1)
+        k = _randint(1, n-1)
+        a = _randint(2, n//4)
+        b = _randint(2, n//4)
+        v = public_params.get('v', _randint(2, n-2))
+        # x is fixed by y and v so that y^2 = x * v (mod n) holds for the response
+        x = (y * y * pow(v, -1, n)) % n
         return {'x': x, 'y': y, 'h': h, 'k': k, 'a': a, 'b': b, 'r': r, 's': s, 'v': v}
     else:
         raise ValueError("Invalid challenge type")
@@ -129,8 +129,9 @@ def verify_response(challenge, commitment, response, public_params):
         a = response['a']
         b = response['b']
         y = commitment['y']
-        lhs = ((x-h)**2)/(a**2) - ((y-k)**2)/(b**2)
-        return math.isclose(lhs, 1.0, rel_tol=1e-9)
+        # The committed y is the hyperbola point rounded to an integer
+        t = ((x-h)**2)/(a**2) - 1
+        return t >= 0 and abs(y - (k + b * math.sqrt(t))) <= 0.5
     elif challenge == '10':
         y = response['y']
         h = response['h']
@@ -138,8 +139,9 @@ def verify_response(challenge, commitment, response, public_params):
         a = response['a']
         b = response['b']
         x = commitment['x']
-        lhs = ((y-k)**2)/(b**2) - ((x-h)**2)/(a**2)
-        return math.isclose(lhs, 1.0, rel_tol=1e-9)
+        # The committed x is the hyperbola point rounded to an integer
+        t = ((y-k)**2)/(b**2) - 1
+        return t >= 0 and abs(x - (h + a * math.sqrt(t))) <= 0.5
     elif challenge == '11':
         y = response['y']
         x = response['x']
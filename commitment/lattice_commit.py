@@ -1,10 +1,10 @@
 # commitment/lattice_commit.py
 
 import numpy as np
-from utils.ntt import ntt, intt
+from numba import njit
+from utils.ntt import ntt_ct, intt_gs
 from utils.params import N, q
-from hash.sha_utils import shake256_hash
-import matplotlib.pyplot as plt
+from hash.sha_utils import poly_digest
 import io
 import base64
 
@@ -51,6 +51,25 @@ def compute_hyperbola_points(x, a, b, is_horizontal=True):
     except Exception as e:
         raise ValueError(f"Hyperbola point computation failed: {e}")
 
+@njit(cache=True)
+def hyperbola_residual(u, v, a2, b2, tol):
+    """
+    Single fused pass over max |u²/a2 - v²/b2 - 1|.
+    
+    Pass (x, y, a², b²) for the horizontal hyperbola and (y, x, a², b²) for
+    the vertical one. Returns as soon as a residual exceeds tol; a NaN
+    residual is returned as-is, so callers should test `not result <= tol`.
+    """
+    m = 0.0
+    for i in range(u.shape[0]):
+        r = u[i] * u[i] / a2 - v[i] * v[i] / b2 - 1.0
+        ar = r if r >= 0.0 else -r
+        if not ar <= tol:
+            return ar
+        if ar > m:
+            m = ar
+    return m
+
 def compute_line_equation(point1, point2):
     """
     Compute the line equation between two points in the lattice.
@@ -92,6 +111,8 @@ def compute_line_equation(point1, point2):
 
 def plot_hyperbola(a, b, challenge_type, private_point, public_point):
     """Plot hyperbola and intersection points."""
+    # Imported on first plot, so verify_lattice_commitment never loads pyplot
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 8))
     
     # Generate points for hyperbola
@@ -137,6 +158,27 @@ def plot_hyperbola(a, b, challenge_type, private_point, public_point):
     buf.seek(0)
     return base64.b64encode(buf.getvalue()).decode('utf-8')
 
+def _main_commitment(x, y, randomness):
+    """x*r + y + e over the NTT; returns (commitment, error, r_ntt, error_ntt)."""
+    # Convert inputs to NTT domain for faster operations
+    x_ntt = ntt_ct(x)
+    y_ntt = ntt_ct(y)
+    r_ntt = ntt_ct(randomness)
+    
+    # Generate small error term with security checks
+    error = np.random.randint(-1, 2, N)
+    if np.abs(error).max() > 1:
+        raise ValueError("Invalid error term generation")
+    error_ntt = ntt_ct(error)
+    
+    # Compute main commitment (pointwise, all operands already reduced mod q)
+    commitment_ntt = (x_ntt * r_ntt + y_ntt + error_ntt) % q
+    return intt_gs(commitment_ntt), error, r_ntt, error_ntt
+
+def lattice_commitment_digest(x, y, randomness):
+    """Binding hash of the main lattice commitment alone, without hyperbola layers or graphs."""
+    return poly_digest(_main_commitment(x, y, randomness)[0])
+
 def create_lattice_commitment(x, y, randomness, a, b, private_key_point, public_key_point):
     """
     Create a lattice-based commitment using NTRU operations.
@@ -156,23 +198,10 @@ def create_lattice_commitment(x, y, randomness, a, b, private_key_point, public_
         if not all(isinstance(arr, np.ndarray) for arr in [x, y, randomness]):
             raise ValueError("Inputs must be numpy arrays")
             
-        # Convert inputs to NTT domain for faster operations
-        x_ntt = ntt(x)
-        y_ntt = ntt(y)
-        r_ntt = ntt(randomness)
-        
-        # Generate small error term with security checks
-        error = np.array([np.random.randint(-1, 2) for _ in range(N)])
-        if not all(abs(e) <= 1 for e in error):
-            raise ValueError("Invalid error term generation")
-        error_ntt = ntt(error)
-        
-        # Compute main commitment
-        commitment_ntt = [(x_ntt[i] * r_ntt[i] + y_ntt[i] + error_ntt[i]) % q for i in range(N)]
-        commitment = intt(commitment_ntt)
+        commitment, error, r_ntt, error_ntt = _main_commitment(x, y, randomness)
         
         # Create binding hash
-        commitment_hash = shake256_hash(str(commitment).encode())
+        commitment_hash = poly_digest(commitment)
         
         # Compute line equation with security checks
         slope, intercept = compute_line_equation(private_key_point, public_key_point)
@@ -182,14 +211,14 @@ def create_lattice_commitment(x, y, randomness, a, b, private_key_point, public_
         x_vert, y_vert = compute_hyperbola_points(x, a, b, is_horizontal=False)
         
         # Create hyperbola commitments
-        horiz_ntt = ntt(x_horiz)
-        vert_ntt = ntt(y_vert)
+        horiz_ntt = ntt_ct(x_horiz)
+        vert_ntt = ntt_ct(y_vert)
         
-        horiz_commitment_ntt = [(horiz_ntt[i] * r_ntt[i] + error_ntt[i]) % q for i in range(N)]
-        vert_commitment_ntt = [(vert_ntt[i] * r_ntt[i] + error_ntt[i]) % q for i in range(N)]
+        horiz_commitment_ntt = (horiz_ntt * r_ntt + error_ntt) % q
+        vert_commitment_ntt = (vert_ntt * r_ntt + error_ntt) % q
         
-        horiz_commitment = intt(horiz_commitment_ntt)
-        vert_commitment = intt(vert_commitment_ntt)
+        horiz_commitment = intt_gs(horiz_commitment_ntt)
+        vert_commitment = intt_gs(vert_commitment_ntt)
         
         # Generate hyperbola graphs
         horiz_graph = plot_hyperbola(a, b, '01', private_key_point, public_key_point)
@@ -252,13 +281,13 @@ def verify_lattice_commitment(commitment_data, challenge=None):
         
         # Recompute and verify main commitment
         print("\n2. Main Commitment Verification:")
-        x_ntt = ntt(x)
-        y_ntt = ntt(y)
-        r_ntt = ntt(randomness)
-        error_ntt = ntt(error)
+        x_ntt = ntt_ct(x)
+        y_ntt = ntt_ct(y)
+        r_ntt = ntt_ct(randomness)
+        error_ntt = ntt_ct(error)
         
-        expected_ntt = [(x_ntt[i] * r_ntt[i] + y_ntt[i] + error_ntt[i]) % q for i in range(N)]
-        expected = intt(expected_ntt)
+        expected_ntt = (x_ntt * r_ntt + y_ntt + error_ntt) % q
+        expected = intt_gs(expected_ntt)
         
         if not np.array_equal(commitment, expected):
             print("   ❌ Error: Commitment computation mismatch")
@@ -267,7 +296,7 @@ def verify_lattice_commitment(commitment_data, challenge=None):
         
         # Verify commitment hash
         print("\n3. Hash Verification:")
-        expected_hash = shake256_hash(str(commitment).encode())
+        expected_hash = poly_digest(commitment)
         if expected_hash != commitment_data['commitment']:
             print("   ❌ Error: Hash mismatch")
             return False
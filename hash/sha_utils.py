@@ -2,11 +2,36 @@
 # Empty __init__.py file for hash directory
 
 import hashlib
+import struct
+import numpy as np
 
 def shake256_hash(data: bytes, digest_len: int = 64) -> str:
     shake = hashlib.shake_256()
     shake.update(data)
     return shake.hexdigest(digest_len)
 
+def poly_digest(poly, digest_len: int = 64) -> str:
+    # SHAKE-256 over the packed int32 coefficients rather than their str() form
+    return shake256_hash(np.asarray(poly, dtype=np.int32).tobytes(), digest_len)
+
 def sha3_512_hash(data: bytes) -> str:
     return hashlib.sha3_512(data).hexdigest()
+
+def commitment_digest(s, extra_randomness, x: int, y: int, h: int, k: int) -> str:
+    # Hash raw int64 buffers and packed scalars instead of a formatted string
+    hasher = hashlib.sha256()
+    hasher.update(np.asarray(s, dtype=np.int64).tobytes())
+    hasher.update(np.asarray(extra_randomness, dtype=np.int64).tobytes())
+    hasher.update(struct.pack('<qqqq', x, y, h, k))
+    return hasher.hexdigest()
+
+def sha256_batch(data, item_len: int) -> bytes:
+    # Zero-copy slices of one buffer; OpenSSL's SHA-256 uses SHA-NI where available
+    view = memoryview(data).cast('B')
+    base = hashlib.sha256()
+    digests = []
+    for i in range(0, len(view), item_len):
+        h = base.copy()
+        h.update(view[i:i + item_len])
+        digests.append(h.digest())
+    return b''.join(digests)
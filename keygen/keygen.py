@@ -24,7 +24,7 @@ except ImportError as e:
     raise
 
 try:
-    from utils.params import N, q, root_of_unity, GAUSSIAN_STDDEV
+    from utils.params import N, q, root_of_unity, GAUSSIAN_STDDEV, COEFF_DTYPE
     from utils.ntt import ntt, intt
     from utils.gaussian import constant_time_gaussian
 except ImportError as e:
@@ -34,7 +34,16 @@ except ImportError as e:
 # Precompute roots of unity and inverses for NTT
 # (Assume root_of_unity is already in params, but you can precompute powers if needed)
 precomputed_roots = np.array([pow(11, i, q) for i in range(N)])  # Example root 11
-precomputed_inverses = np.array([pow(i, -1, q) if i != 0 else 0 for i in range(1, q)])
+
+def _inverse_table(q):
+    """Inverses of 1..q-1 mod prime q by inv[i] = -(q // i) * inv[q % i], one multiply each."""
+    inv = [0, 1] + [0] * (q - 2)
+    for i in range(2, q):
+        inv[i] = (q - (q // i) * inv[q % i] % q) % q
+    return np.array(inv[1:])
+
+# precomputed_inverses[i - 1] == i^-1 mod q
+precomputed_inverses = _inverse_table(q)
 
 
 def sample_poly_uniform(N, q):
@@ -43,7 +52,7 @@ def sample_poly_uniform(N, q):
 
 def sample_poly_small(N):
     """Sample N coefficients from {-1, 0, 1} (constant-time)."""
-    return np.random.choice([-1, 0, 1], size=N)
+    return np.random.choice([-1, 0, 1], size=N).astype(COEFF_DTYPE)
 
 
 class KeyGenerationError(Exception):
@@ -244,14 +253,11 @@ class AdvancedKeyGenerator:
             # Sample secret polynomials
             f = sample_poly_small(N)
             g = sample_poly_small(N)
-            # Ensure f[0] is invertible modulo q
+            # Ensure f[0] is invertible modulo q (a nonzero table entry)
             while True:
                 f[0] = random.randint(1, q-1)
-                try:
-                    pow(int(f[0]), -1, q)
+                if precomputed_inverses[f[0] - 1]:
                     break
-                except ValueError:
-                    continue
             
             # Precompute NTTs if needed (not shown here)
             # ...
@@ -272,7 +278,7 @@ class AdvancedKeyGenerator:
             }
             
             public_key = {
-                'h_pub': np.random.randint(0, q, size=N),  # Placeholder
+                'h_pub': np.random.randint(0, q, size=N, dtype=COEFF_DTYPE),  # Placeholder
                 'params': {'N': N, 'q': q}
             }
             
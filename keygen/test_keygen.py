@@ -0,0 +1,18 @@
+# keygen/test_keygen.py
+
+import numpy as np
+import pytest
+from keygen.keygen import _inverse_table, precomputed_inverses
+from utils.params import q
+
+@pytest.mark.parametrize("modulus", [2, 3, 17, 257, q])
+def test_inverse_table_inverts_every_residue(modulus):
+    table = _inverse_table(modulus)
+    i = np.arange(1, modulus, dtype=np.int64)
+    # table[i - 1] holds i^-1, since residue 0 has no inverse
+    assert table.shape == (modulus - 1,)
+    assert np.all(table * i % modulus == 1)
+
+def test_precomputed_inverses_cover_q():
+    i = np.arange(1, q, dtype=np.int64)
+    assert np.all(precomputed_inverses * i % q == 1)
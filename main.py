@@ -34,7 +34,7 @@ def main():
                 
                 # Verify signature
                 print("Verifying signature...")
-                is_valid = verify_signature(message_bytes, signature, public_key)
+                is_valid = verify_signature(message_bytes, signature, public_key, verbose=True)
                 print(f"Signature verification: {'Valid' if is_valid else 'Invalid'}")
                 
             except SigningError as e:
@@ -1,9 +1,111 @@
 import numpy as np
-from typing import Tuple, List, Dict, Any
+from dataclasses import dataclass, field, fields
+from typing import Tuple, List, Dict, Any, Optional, Union
 from utils.params import N, q
+from numba import njit
 import hashlib
 import random
 
+# One bit per optional proof field, used for single-AND presence checks
+FIELD_BITS = {
+    's': 1 << 0,
+    'message_hash': 1 << 1,
+    'y_squared': 1 << 2,
+    'xv': 1 << 3,
+    'x_values': 1 << 4,
+    'commitment': 1 << 5,
+    'challenge': 1 << 6,
+    'response': 1 << 7,
+}
+REQUIRED_00 = FIELD_BITS['s'] | FIELD_BITS['message_hash'] | FIELD_BITS['y_squared']
+REQUIRED_11 = REQUIRED_00 | FIELD_BITS['xv']
+REQUIRED_GENERIC = FIELD_BITS['commitment'] | FIELD_BITS['challenge'] | FIELD_BITS['response']
+
+@dataclass(slots=True)
+class Proof:
+    """Typed Fiat-Shamir proof; array fields are converted once by from_dict."""
+    challenge_type: Optional[str] = None
+    s: Optional[np.ndarray] = None
+    message_hash: Any = None
+    y_squared: Optional[np.ndarray] = None
+    xv: Optional[np.ndarray] = None
+    x_values: Optional[np.ndarray] = None
+    commitment: Any = None
+    challenge: Any = None
+    response: Any = None
+    _mask: int = field(default=0, init=False, repr=False, compare=False)
+    # Result of the y² == x·v check, filled in by the first challenge_11_holds call
+    _holds_11: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Presence bitmap is computed once at construction
+        mask = 0
+        for name, bit in FIELD_BITS.items():
+            if getattr(self, name) is not None:
+                mask |= bit
+        self._mask = mask
+
+    def missing(self, required_mask: int) -> List[str]:
+        """Names of the required fields absent from this proof."""
+        absent = required_mask & ~self._mask
+        return [name for name, bit in FIELD_BITS.items() if absent & bit]
+
+    def challenge_11_holds(self) -> bool:
+        """y² == x·v for this proof; computed once, so later checks on the same Proof reuse it."""
+        if self._holds_11 is None:
+            self._holds_11 = _challenge_11_holds(self.y_squared, self.xv)
+        return self._holds_11
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'Proof':
+        """Build a Proof from a signature/proof dict, ignoring unknown keys."""
+        def _int_array(key):
+            return np.asarray(d[key], dtype=np.int64) if key in d else None
+        return cls(
+            challenge_type=d.get('challenge_type'),
+            s=np.asarray(d['s']) if 's' in d else None,
+            message_hash=d.get('message_hash'),
+            y_squared=_int_array('y_squared'),
+            xv=_int_array('xv'),
+            x_values=_int_array('x_values'),
+            commitment=d.get('commitment'),
+            challenge=d.get('challenge'),
+            response=d.get('response'),
+        )
+
+    def present_fields(self) -> List[str]:
+        """Names of the fields that were supplied."""
+        return [f.name for f in fields(self) if not f.name.startswith('_') and getattr(self, f.name) is not None]
+
+@njit(cache=True)
+def _verify_challenge_11_arrays(y_squared, xv):
+    """Compiled y² == x·v comparison over two 1-D int64 vectors."""
+    if y_squared.shape[0] != xv.shape[0]:
+        return False
+    for i in range(y_squared.shape[0]):
+        if y_squared[i] != xv[i]:
+            return False
+    return True
+
+def _challenge_11_holds(y_squared: np.ndarray, xv: np.ndarray) -> bool:
+    """Use the compiled kernel for flat int64 vectors, NumPy otherwise."""
+    if (y_squared.ndim == 1 and xv.ndim == 1
+            and y_squared.dtype == np.int64 and xv.dtype == np.int64):
+        return _verify_challenge_11_arrays(y_squared, xv)
+    return np.array_equal(y_squared, xv)
+
+def _as_proof(proof: Union[Proof, Dict[str, Any]]) -> Proof:
+    """Accept either a Proof or a legacy proof dict.
+
+    A Proof is returned as is, so checks run on it share its cached results;
+    a dict is converted afresh on every call.
+    """
+    if isinstance(proof, Proof):
+        return proof
+    if not isinstance(proof, dict):
+        raise TypeError(f"Expected Proof or dict, got {type(proof).__name__}")
+    return Proof.from_dict(proof)
+
 class FiatShamirSecurity:
     def __init__(self):
         self.zero_knowledge_threshold = 0.1
@@ -11,13 +113,14 @@ class FiatShamirSecurity:
         self.knowledge_extraction_threshold = 0.3
         self.parallel_session_threshold = 0.4
 
-    def check_zero_knowledge(self, proof: Dict[str, Any], witness: Dict[str, Any]) -> bool:
+    def check_zero_knowledge(self, proof: Union[Proof, Dict[str, Any]], witness: Dict[str, Any]) -> bool:
         """Check for zero-knowledge proof attacks."""
         try:
+            proof = _as_proof(proof)
             print("\nZero-Knowledge Check Diagnostic:")
-            challenge_type = proof.get('challenge_type')
+            challenge_type = proof.challenge_type
             print(f"Challenge type: {challenge_type}")
-            print(f"Available fields: {list(proof.keys())}")
+            print(f"Available fields: {proof.present_fields()}")
             
             # For standard Fiat-Shamir challenges (00 and 11)
             if challenge_type in ['00', '11']:
@@ -27,16 +130,16 @@ class FiatShamirSecurity:
                 if challenge_type == '00':
                     print("Verifying Fiat-Shamir c=0: y² ≡ x (mod n)")
                     # Get y_squared from proof
-                    if 'y_squared' not in proof:
+                    if proof.y_squared is None:
                         print("Missing 'y_squared' in proof")
                         return False
-                    y_squared = np.array(proof['y_squared'], dtype=np.int64)
+                    y_squared = proof.y_squared
                     
                     # Get x_values from proof
-                    if 'x_values' not in proof:
+                    if proof.x_values is None:
                         print("Missing 'x_values' in proof")
                         return False
-                    x = np.array(proof['x_values'], dtype=np.int64)
+                    x = proof.x_values
                     
                     # Verify y² ≡ x (mod n)
                     if not np.array_equal(y_squared, x):
@@ -49,14 +152,14 @@ class FiatShamirSecurity:
                 elif challenge_type == '11':
                     print("Verifying Fiat-Shamir c=1: y² ≡ x * v (mod n)")
                     # Get y_squared and xv from proof
-                    if 'y_squared' not in proof or 'xv' not in proof:
+                    if proof.y_squared is None or proof.xv is None:
                         print("Missing 'y_squared' or 'xv' in proof")
                         return False
-                    y_squared = np.array(proof['y_squared'], dtype=np.int64)
-                    xv = np.array(proof['xv'], dtype=np.int64)
+                    y_squared = proof.y_squared
+                    xv = proof.xv
                     
                     # Verify y² ≡ x * v (mod n)
-                    if not np.array_equal(y_squared, xv):
+                    if not proof.challenge_11_holds():
                         print("Verification failed: y² ≢ x * v (mod n)")
                         print(f"y_squared: {y_squared[:5]}...")
                         print(f"x * v: {xv[:5]}...")
@@ -81,11 +184,12 @@ class FiatShamirSecurity:
             print(f"Error in zero-knowledge check: {str(e)}")
             return False
 
-    def check_soundness(self, proof: Dict[str, Any], statement: Dict[str, Any]) -> bool:
+    def check_soundness(self, proof: Union[Proof, Dict[str, Any]], statement: Dict[str, Any]) -> bool:
         """Check for soundness attacks."""
         try:
+            proof = _as_proof(proof)
             print("\nSoundness Check Diagnostic:")
-            challenge_type = proof.get('challenge_type')
+            challenge_type = proof.challenge_type
             print(f"Challenge type: {challenge_type}")
             
             # For standard Fiat-Shamir challenges (00 and 11)
@@ -93,26 +197,17 @@ class FiatShamirSecurity:
                 print(f"Processing Fiat-Shamir challenge {challenge_type}")
                 
                 # Check if all required fields are present
-                required_fields = ['s', 'message_hash', 'y_squared']
-                if challenge_type == '11':
-                    required_fields.append('xv')
-                
-                for field in required_fields:
-                    if field not in proof:
-                        print(f"Missing required field: {field}")
-                        return False
-                
-                # Verify the message hash
-                if 'message_hash' not in proof:
-                    print("Missing message_hash in proof")
+                required_mask = REQUIRED_11 if challenge_type == '11' else REQUIRED_00
+                if (proof._mask & required_mask) != required_mask:
+                    print(f"Missing required field: {proof.missing(required_mask)[0]}")
                     return False
                 
                 # For challenge 11, verify y² ≡ x * v (mod n)
                 if challenge_type == '11':
-                    y_squared = np.array(proof['y_squared'], dtype=np.int64)
-                    xv = np.array(proof['xv'], dtype=np.int64)
+                    y_squared = proof.y_squared
+                    xv = proof.xv
                     
-                    if not np.array_equal(y_squared, xv):
+                    if not proof.challenge_11_holds():
                         print("Verification failed: y² ≢ x * v (mod n)")
                         print(f"y_squared: {y_squared[:5]}...")
                         print(f"x * v: {xv[:5]}...")
@@ -141,11 +236,12 @@ class FiatShamirSecurity:
             print(f"Error in soundness check: {str(e)}")
             return False
 
-    def check_knowledge_extraction(self, proof: Dict[str, Any]) -> bool:
+    def check_knowledge_extraction(self, proof: Union[Proof, Dict[str, Any]]) -> bool:
         """Check for knowledge extraction attacks."""
         try:
+            proof = _as_proof(proof)
             print("\nKnowledge Extraction Check Diagnostic:")
-            challenge_type = proof.get('challenge_type')
+            challenge_type = proof.challenge_type
             print(f"Challenge type: {challenge_type}")
             
             # For standard Fiat-Shamir challenges (00 and 11)
@@ -153,14 +249,10 @@ class FiatShamirSecurity:
                 print(f"Processing Fiat-Shamir challenge {challenge_type}")
                 
                 # Check if all required fields are present
-                required_fields = ['s', 'message_hash', 'y_squared']
-                if challenge_type == '11':
-                    required_fields.append('xv')
-                
-                for field in required_fields:
-                    if field not in proof:
-                        print(f"Missing required field: {field}")
-                        return False
+                required_mask = REQUIRED_11 if challenge_type == '11' else REQUIRED_00
+                if (proof._mask & required_mask) != required_mask:
+                    print(f"Missing required field: {proof.missing(required_mask)[0]}")
+                    return False
                 
                 # Check if the proof is properly randomized
                 if not self._is_properly_randomized(proof):
@@ -190,9 +282,10 @@ class FiatShamirSecurity:
             print(f"Error in knowledge extraction check: {str(e)}")
             return False
 
-    def check_parallel_session(self, proofs: List[Dict[str, Any]]) -> bool:
+    def check_parallel_session(self, proofs: List[Union[Proof, Dict[str, Any]]]) -> bool:
         """Check for parallel session attacks."""
         try:
+            proofs = [_as_proof(proof) for proof in proofs]
             # Check session independence
             if not self._verify_session_independence(proofs):
                 return False
@@ -209,216 +302,172 @@ class FiatShamirSecurity:
         except Exception:
             return False
 
-    def _verify_completeness(self, proof: Dict[str, Any], witness: Dict[str, Any]) -> bool:
+    def _verify_completeness(self, proof: Proof, witness: Dict[str, Any]) -> bool:
         """Verify proof completeness."""
-        try:
-            # Check if proof contains all necessary information
-            required_fields = ['commitment', 'challenge', 'response']
-            if not all(field in proof for field in required_fields):
-                return False
-                
-            # Check if witness matches proof
-            if not self._verify_witness_match(proof, witness):
-                return False
-                
-            return True
-        except Exception:
+        # Check if proof contains all necessary information
+        if (proof._mask & REQUIRED_GENERIC) != REQUIRED_GENERIC:
             return False
+            
+        # Check if witness matches proof
+        if not self._verify_witness_match(proof, witness):
+            return False
+            
+        return True
 
-    def _verify_soundness(self, proof: Dict[str, Any]) -> bool:
+    def _verify_soundness(self, proof: Proof) -> bool:
         """Verify proof soundness."""
-        try:
-            # Check challenge generation
-            if not self._verify_challenge(proof['challenge']):
-                return False
-                
-            # Check response validity
-            if not self._verify_response(proof['response']):
-                return False
-                
-            return True
-        except Exception:
+        # Check challenge generation
+        if not self._verify_challenge(proof.challenge):
+            return False
+            
+        # Check response validity
+        if not self._verify_response(proof.response):
             return False
+            
+        return True
 
-    def _verify_zero_knowledge(self, proof: Dict[str, Any]) -> bool:
+    def _verify_zero_knowledge(self, proof: Proof) -> bool:
         """Verify zero-knowledge property."""
-        try:
-            # Check if proof reveals any information about witness
-            if self._reveals_witness(proof):
-                return False
-                
-            # Check if proof is simulatable
-            if not self._is_simulatable(proof):
-                return False
-                
-            return True
-        except Exception:
+        # Check if proof reveals any information about witness
+        if self._reveals_witness(proof):
             return False
+            
+        # Check if proof is simulatable
+        if not self._is_simulatable(proof):
+            return False
+            
+        return True
 
-    def _verify_proof(self, proof: Dict[str, Any], statement: Dict[str, Any]) -> bool:
+    def _verify_proof(self, proof: Proof, statement: Dict[str, Any]) -> bool:
         """Verify proof validity."""
-        try:
-            # Check proof structure
-            if not self._verify_proof_structure(proof):
-                return False
-                
-            # Check proof consistency with statement
-            if not self._verify_statement_consistency(proof, statement):
-                return False
-                
-            return True
-        except Exception:
+        # Check proof structure
+        if not self._verify_proof_structure(proof):
             return False
+            
+        # Check proof consistency with statement
+        if not self._verify_statement_consistency(proof, statement):
+            return False
+            
+        return True
 
-    def _verify_consistency(self, proof: Dict[str, Any]) -> bool:
+    def _verify_consistency(self, proof: Proof) -> bool:
         """Verify proof consistency."""
-        try:
-            # Check if commitment matches challenge
-            if not self._verify_commitment_challenge_match(proof):
-                return False
-                
-            # Check if response matches commitment and challenge
-            if not self._verify_response_match(proof):
-                return False
-                
-            return True
-        except Exception:
+        # Check if commitment matches challenge
+        if not self._verify_commitment_challenge_match(proof):
+            return False
+            
+        # Check if response matches commitment and challenge
+        if not self._verify_response_match(proof):
             return False
+            
+        return True
 
-    def _verify_uniqueness(self, proof: Dict[str, Any]) -> bool:
+    def _verify_uniqueness(self, proof: Proof) -> bool:
         """Verify proof uniqueness."""
-        try:
-            # Check if proof is unique for given statement
-            if not self._is_unique_proof(proof):
-                return False
-                
-            return True
-        except Exception:
+        # Check if proof is unique for given statement
+        if not self._is_unique_proof(proof):
             return False
+            
+        return True
 
-    def _verify_proof_structure(self, proof: Dict[str, Any]) -> bool:
+    def _verify_proof_structure(self, proof: Proof) -> bool:
         """Verify proof structure."""
-        try:
-            # Check required fields
-            required_fields = ['commitment', 'challenge', 'response']
-            if not all(field in proof for field in required_fields):
-                return False
-                
-            # Check field types and values
-            if not all(isinstance(proof[field], (int, str, bytes)) for field in required_fields):
-                return False
-                
-            return True
-        except Exception:
+        # Check required fields
+        if (proof._mask & REQUIRED_GENERIC) != REQUIRED_GENERIC:
             return False
+            
+        # Check field types and values
+        if not all(isinstance(value, (int, str, bytes)) for value in (proof.commitment, proof.challenge, proof.response)):
+            return False
+            
+        return True
 
-    def _verify_binding(self, proof: Dict[str, Any]) -> bool:
+    def _verify_binding(self, proof: Proof) -> bool:
         """Verify proof binding."""
-        try:
-            # Check if commitment is binding
-            if not self._is_binding_commitment(proof['commitment']):
-                return False
-                
-            return True
-        except Exception:
+        # Check if commitment is binding
+        if not self._is_binding_commitment(proof.commitment):
             return False
+            
+        return True
 
-    def _verify_hiding(self, proof: Dict[str, Any]) -> bool:
+    def _verify_hiding(self, proof: Proof) -> bool:
         """Verify proof hiding."""
-        try:
-            # Check if commitment is hiding
-            if not self._is_hiding_commitment(proof['commitment']):
-                return False
-                
-            return True
-        except Exception:
+        # Check if commitment is hiding
+        if not self._is_hiding_commitment(proof.commitment):
             return False
+            
+        return True
 
-    def _verify_session_independence(self, proofs: List[Dict[str, Any]]) -> bool:
+    def _verify_session_independence(self, proofs: List[Proof]) -> bool:
         """Verify session independence."""
-        try:
-            # Check if sessions are independent
-            for i in range(len(proofs)):
-                for j in range(i + 1, len(proofs)):
-                    if self._are_dependent_sessions(proofs[i], proofs[j]):
-                        return False
-                        
-            return True
-        except Exception:
-            return False
-
-    def _verify_session_consistency(self, proofs: List[Dict[str, Any]]) -> bool:
-        """Verify session consistency."""
-        try:
-            # Check if sessions are consistent
-            for proof in proofs:
-                if not self._verify_consistency(proof):
+        # Check if sessions are independent
+        for i in range(len(proofs)):
+            for j in range(i + 1, len(proofs)):
+                if self._are_dependent_sessions(proofs[i], proofs[j]):
                     return False
                     
-            return True
-        except Exception:
-            return False
+        return True
 
-    def _verify_session_uniqueness(self, proofs: List[Dict[str, Any]]) -> bool:
+    def _verify_session_consistency(self, proofs: List[Proof]) -> bool:
+        """Verify session consistency."""
+        # Check if sessions are consistent
+        for proof in proofs:
+            if not self._verify_consistency(proof):
+                return False
+                
+        return True
+                
+    def _verify_session_uniqueness(self, proofs: List[Proof]) -> bool:
         """Verify session uniqueness."""
-        try:
-            # Check if sessions are unique
-            for i in range(len(proofs)):
-                for j in range(i + 1, len(proofs)):
-                    if self._are_identical_sessions(proofs[i], proofs[j]):
-                        return False
-                        
-            return True
-        except Exception:
-            return False
+        # Check if sessions are unique
+        for i in range(len(proofs)):
+            for j in range(i + 1, len(proofs)):
+                if self._are_identical_sessions(proofs[i], proofs[j]):
+                    return False
+                    
+        return True
 
-    def _is_properly_randomized(self, proof: Dict[str, Any]) -> bool:
+    def _is_properly_randomized(self, proof: Proof) -> bool:
         """Check if the proof is properly randomized."""
-        try:
-            print("\nRandomization Check Diagnostic:")
-            challenge_type = proof.get('challenge_type')
-            print(f"Challenge type: {challenge_type}")
-            
-            # For standard Fiat-Shamir challenges (00 and 11)
-            if challenge_type in ['00', '11']:
-                print(f"Processing Fiat-Shamir challenge {challenge_type}")
-                
-                # Check if s has sufficient entropy
-                if 's' in proof:
-                    s_array = np.array(proof['s'])
-                    unique_count = len(np.unique(s_array))
-                    total_count = len(s_array)
-                    print(f"Unique values in s: {unique_count}/{total_count}")
-                    
-                    # For Fiat-Shamir, we expect some repetition in s
-                    if unique_count < total_count // 4:
-                        print("Insufficient entropy in s")
-                        return False
-                
-                # For challenge 11, check y_squared and xv
-                if challenge_type == '11':
-                    if 'y_squared' in proof and 'xv' in proof:
-                        y_squared = np.array(proof['y_squared'])
-                        xv = np.array(proof['xv'])
+        print("\nRandomization Check Diagnostic:")
+        challenge_type = proof.challenge_type
+        print(f"Challenge type: {challenge_type}")
                         
-                        # They should be equal for challenge 11
-                        if not np.array_equal(y_squared, xv):
-                            print("y_squared and xv are not equal")
-                            return False
-                
-                print("✓ Proof is properly randomized")
-                return True
+        # For standard Fiat-Shamir challenges (00 and 11)
+        if challenge_type in ['00', '11']:
+            print(f"Processing Fiat-Shamir challenge {challenge_type}")
+
+            # Check if s has sufficient entropy
+            if proof.s is not None:
+                s_array = proof.s
+                unique_count = len(np.unique(s_array))
+                total_count = len(s_array)
+                print(f"Unique values in s: {unique_count}/{total_count}")
             
-            # For other challenge types, use standard checks
-            if 's' in proof:
-                s_array = np.array(proof['s'])
-                if len(np.unique(s_array)) < len(s_array) // 2:
+                # For Fiat-Shamir, we expect some repetition in s
+                if unique_count < total_count // 4:
                     print("Insufficient entropy in s")
                     return False
             
+            # For challenge 11, check y_squared and xv
+            if challenge_type == '11':
+                if proof.y_squared is not None and proof.xv is not None:
+                    # They should be equal for challenge 11; reuses check_soundness's
+                    # result when both run on the same Proof
+                    if not proof.challenge_11_holds():
+                        print("y_squared and xv are not equal")
+                        return False
+            
             print("✓ Proof is properly randomized")
             return True
             
-        except Exception as e:
-            print(f"Error in randomization check: {str(e)}")
-            return False 
\ No newline at end of file
+        # For other challenge types, use standard checks
+        if proof.s is not None:
+            s_array = proof.s
+            if len(np.unique(s_array)) < len(s_array) // 2:
+                print("Insufficient entropy in s")
+                return False
+        
+        print("✓ Proof is properly randomized")
+        return True
+        
\ No newline at end of file
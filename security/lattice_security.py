@@ -15,6 +15,15 @@ class LatticeSecurity:
             # Convert 1D array to 2D if necessary
             if len(basis.shape) == 1:
                 basis = basis.reshape(1, -1)
+
+            # A single row gives det = ‖v‖² and norm_product = ‖v‖, so the
+            # quality metric is identically 1 and the check always passes
+            if basis.shape[0] == 1:
+                print("\nLattice Basis Diagnostic:")
+                print(f"Basis shape: {basis.shape}")
+                print("1-row basis, quality metric: 1.0")
+                print("Lattice basis reduction check passed")
+                return True
             
             # Calculate Gram matrix
             gram_matrix = np.dot(basis, basis.T)
@@ -54,6 +63,7 @@ class LatticeSecurity:
         """Check if a vector is short enough to be a valid signature."""
         try:
             print("\nShort Vector Diagnostic:")
+            max_allowed = 1e100  # Set a reasonable maximum value
             # Convert to numpy array if not already
             if not isinstance(vector, np.ndarray):
                 vector = np.array(vector)
@@ -65,19 +75,15 @@ class LatticeSecurity:
             if len(vector.shape) == 1:
                 # Handle object arrays with large integers
                 if vector.dtype == np.object_:
-                    # First check if any value exceeds our maximum allowed value
-                    max_allowed = 1e100  # Set a reasonable maximum value
-                    for x in vector:
-                        abs_x = abs(int(x))
-                        if abs_x > max_allowed:
-                            print(f"Vector contains value {abs_x} which exceeds maximum allowed value {max_allowed}")
-                            return False
+                    # tolist() converts in one C call; max/sum iterate at C level
+                    values = [int(x) for x in vector.tolist()]
+                    max_abs = max(map(abs, values), default=0)
+                    if max_abs > max_allowed:
+                        print(f"Vector contains value {max_abs} which exceeds maximum allowed value {max_allowed}")
+                        return False
                     
                     # If all values are within limits, calculate norm directly
-                    sum_squares = 0
-                    for x in vector:
-                        sum_squares += int(x) * int(x)
-                    norm = np.sqrt(sum_squares)
+                    norm = np.sqrt(sum(x * x for x in values))
                 else:
                     # For other types, use standard calculation
                     norm = np.sqrt(np.sum(np.square(vector)))
@@ -99,17 +105,14 @@ class LatticeSecurity:
                     # Handle object arrays with large integers
                     if basis_vector.dtype == np.object_:
                         # Check for maximum value
-                        for x in basis_vector:
-                            abs_x = abs(int(x))
-                            if abs_x > max_allowed:
-                                print(f"Basis vector {i} contains value {abs_x} which exceeds maximum allowed value {max_allowed}")
-                                return False
+                        values = [int(x) for x in basis_vector.tolist()]
+                        max_abs = max(map(abs, values), default=0)
+                        if max_abs > max_allowed:
+                            print(f"Basis vector {i} contains value {max_abs} which exceeds maximum allowed value {max_allowed}")
+                            return False
                         
                         # Calculate norm if within limits
-                        sum_squares = 0
-                        for x in basis_vector:
-                            sum_squares += int(x) * int(x)
-                        norm = np.sqrt(sum_squares)
+                        norm = np.sqrt(sum(x * x for x in values))
                     else:
                         norm = np.sqrt(np.sum(np.square(basis_vector)))
                     
@@ -160,24 +163,18 @@ class LatticeSecurity:
 
     def _is_uniform(self, sample: np.ndarray) -> bool:
         """Check if sample follows uniform distribution."""
-        try:
-            # Perform statistical test
-            hist, _ = np.histogram(sample, bins=10)
-            expected = len(sample) / 10
-            chi_square = np.sum((hist - expected)**2 / expected)
-            return chi_square < self.rlwe_threshold
-        except Exception:
-            return False
+        # Perform statistical test
+        hist, _ = np.histogram(sample, bins=10)
+        expected = len(sample) / 10
+        chi_square = np.sum((hist - expected)**2 / expected)
+        return chi_square < self.rlwe_threshold
 
     def _are_independent(self, samples: List[np.ndarray]) -> bool:
         """Check if samples are independent."""
-        try:
-            # Check correlation between samples
-            for i in range(len(samples)):
-                for j in range(i + 1, len(samples)):
-                    correlation = np.corrcoef(samples[i], samples[j])[0, 1]
-                    if abs(correlation) > self.rlwe_threshold:
-                        return False
-            return True
-        except Exception:
-            return False 
\ No newline at end of file
+        # Check correlation between samples
+        for i in range(len(samples)):
+            for j in range(i + 1, len(samples)):
+                correlation = np.corrcoef(samples[i], samples[j])[0, 1]
+                if abs(correlation) > self.rlwe_threshold:
+                    return False
+        return True
\ No newline at end of file
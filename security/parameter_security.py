@@ -1,7 +1,12 @@
 import numpy as np
 from typing import Dict, Any, List
 from utils.params import N, q
-import math
+from utils.miller_rabin import is_prime_u64
+
+try:
+    import gmpy2  # optional: GMP keeps the big-modulus squarings in C
+except ImportError:
+    gmpy2 = None
 
 class ParameterSecurity:
     def __init__(self):
@@ -12,6 +17,11 @@ class ParameterSecurity:
         self.min_entropy = 128
         self.max_coefficient = 2**32
         
+    @property
+    def _entropy_threshold(self) -> int:
+        """Unique coefficients required by min_entropy (2^min_entropy)."""
+        return 1 << self.min_entropy
+        
     def check_polynomial_parameters(self, poly: np.ndarray) -> bool:
         """Verify polynomial parameters are secure."""
         try:
@@ -20,16 +30,27 @@ class ParameterSecurity:
                 print(f"❌ Invalid polynomial degree: {len(poly)}")
                 return False
                 
-            # Check coefficient bounds
-            max_coeff = np.max(np.abs(poly))
+            # Check coefficient bounds: two streaming reductions, no |poly| temporary
+            poly = np.asarray(poly)
+            hi = int(poly.max())
+            lo = int(poly.min())
+            max_coeff = hi if hi > -lo else -lo
             if max_coeff > self.max_coefficient:
                 print(f"❌ Coefficients too large: {max_coeff}")
                 return False
                 
-            # Check entropy
-            unique_coeffs = len(np.unique(poly))
-            if unique_coeffs < 2**self.min_entropy:
-                print(f"❌ Insufficient entropy: {unique_coeffs} unique coefficients")
+            # Check entropy: a length-n poly has at most n distinct values, so cap
+            # the target there and stop as soon as it becomes unreachable
+            target = min(self._entropy_threshold, len(poly))
+            seen = set()
+            remaining = len(poly)
+            for coeff in np.asarray(poly).tolist():
+                remaining -= 1
+                seen.add(coeff)
+                if len(seen) >= target or len(seen) + remaining < target:
+                    break
+            if len(seen) < target:
+                print(f"❌ Insufficient entropy: fewer than {target} unique coefficients")
                 return False
                 
             print("✓ Polynomial parameters verified")
@@ -42,12 +63,17 @@ class ParameterSecurity:
     def check_modulus_parameters(self, modulus: int) -> bool:
         """Verify modulus parameters are secure."""
         try:
-            # Check bit length
-            bits = math.ceil(math.log2(modulus))
+            # Check bit length (exact for big ints, equals ceil(log2(modulus)))
+            bits = (modulus - 1).bit_length()
             if bits < self.min_modulus_bits or bits > self.max_modulus_bits:
                 print(f"❌ Invalid modulus bit length: {bits}")
                 return False
                 
+            # Even moduli other than 2 are composite, no need for Miller-Rabin
+            if modulus & 1 == 0 and modulus != 2:
+                print("❌ Modulus is not prime")
+                return False
+
             # Check if modulus is prime
             if not self._is_prime(modulus):
                 print("❌ Modulus is not prime")
@@ -67,24 +93,36 @@ class ParameterSecurity:
         for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]:
             if n % p == 0:
                 return n == p
+        if n < (1 << 64):
+            # Word-sized moduli: Montgomery-form Miller-Rabin in native uint64
+            return bool(is_prime_u64(np.uint64(n)))
         d = n - 1
         s = 0
         while d % 2 == 0:
             d //= 2
             s += 1
+        if gmpy2 is not None:
+            n, d = gmpy2.mpz(n), gmpy2.mpz(d)
         for a in [2, 325, 9375, 28178, 450775, 9780504, 1795265022]:
             if a >= n:
                 continue
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                continue
-            for _ in range(s - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
+            if not self._mr_witness(a, d, n, s):
                 return False
         return True
+
+    def _mr_witness(self, a: int, d: int, n: int, s: int) -> bool:
+        """Single Miller-Rabin round; True if n passes for base a."""
+        if gmpy2 is not None:
+            x = gmpy2.powmod(a, d, n)
+        else:
+            x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            return True
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                return True
+        return False
         
     def check_parameter_relationships(self, params: Dict[str, Any]) -> bool:
         """Verify relationships between different parameters."""
@@ -1,16 +1,45 @@
 import numpy as np
+from collections import defaultdict
 from typing import Dict, Any, List, Tuple
-from utils.params import N, q
+from utils.params import N, q, root_of_unity
+from utils.ntt import ntt_inplace, psi_table_bitrev
 import time
 import hashlib
 import random
+import secrets
+from hash.sha_utils import sha256_batch
+
+_RNG = np.random.default_rng()
+
+class _RunStat:
+    """Running mean and variance (Welford) in constant memory."""
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    @property
+    def var(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
 
 class PerformanceSecurity:
     def __init__(self):
         self.benchmark_iterations = 1000
-        self.fiat_shamir_times = []
-        self.falcon_times = []
-        self.our_times = []
+        # Per-operation running stats, so repeated benchmark runs stay O(1) in memory
+        self.fiat_shamir_times = defaultdict(_RunStat)
+        self.falcon_times = defaultdict(_RunStat)
+        self.our_times = defaultdict(_RunStat)
+        # Bit-reversed powers of a primitive 2N-th root of unity (root_of_unity generates Z_q*)
+        self.psi_table = psi_table_bitrev(pow(root_of_unity, (q - 1) // (2 * N), q), q, N)
+        ntt_inplace(np.zeros(N, dtype=np.int64), self.psi_table, q)  # compile outside the timed loops
         
     def benchmark_operations(self) -> Dict[str, float]:
         """Benchmark key operations against Fiat-Shamir and Falcon."""
@@ -33,43 +62,54 @@ class PerformanceSecurity:
             
     def _benchmark_signature_generation(self) -> float:
         """Benchmark signature generation performance."""
-        start_time = time.time()
-        for _ in range(self.benchmark_iterations):
+        # Draw all inputs up front so the timed region only covers the operation
+        s_ntt_batch = np.random.randint(-1, 2, size=(self.benchmark_iterations, N)).astype(np.int64)
+        start_time = time.perf_counter_ns()
+        for i in range(self.benchmark_iterations):
             # Simulate signature generation
-            s = np.random.randint(-1, 2, size=N)
-            s_ntt = np.fft.fft(s)
-            _ = hashlib.sha256(s_ntt.tobytes()).digest()
-        return (time.time() - start_time) / self.benchmark_iterations
+            ntt_inplace(s_ntt_batch[i], self.psi_table, q)
+        # Hash all transcripts in one batched pass over a contiguous buffer
+        _ = sha256_batch(s_ntt_batch, s_ntt_batch.itemsize * N)
+        return (time.perf_counter_ns() - start_time) / 1e9 / self.benchmark_iterations
         
     def _benchmark_signature_verification(self) -> float:
         """Benchmark signature verification performance."""
-        start_time = time.time()
-        for _ in range(self.benchmark_iterations):
+        signatures = np.random.randint(-1, 2, size=(self.benchmark_iterations, N)).astype(np.int64)
+        sha_base = hashlib.sha256()
+        start_time = time.perf_counter_ns()
+        for i in range(self.benchmark_iterations):
             # Simulate signature verification
-            s = np.random.randint(-1, 2, size=N)
-            s_ntt = np.fft.fft(s)
-            h = hashlib.sha256(s_ntt.tobytes()).digest()
-            _ = hashlib.sha256(h).digest()
-        return (time.time() - start_time) / self.benchmark_iterations
+            s_ntt = ntt_inplace(signatures[i], self.psi_table, q)
+            h = sha_base.copy()
+            h.update(s_ntt)
+            outer = sha_base.copy()
+            outer.update(h.digest())
+            _ = outer.digest()
+        return (time.perf_counter_ns() - start_time) / 1e9 / self.benchmark_iterations
         
     def _benchmark_key_generation(self) -> float:
         """Benchmark key generation performance."""
-        start_time = time.time()
+        # Sampling is the operation under test here, so it stays in the timed region
+        start_time = time.perf_counter_ns()
         for _ in range(self.benchmark_iterations):
-            # Simulate key generation
-            _ = np.random.randint(0, q, size=N)
-            _ = np.random.randint(0, q, size=N)
-        return (time.time() - start_time) / self.benchmark_iterations
+            # Simulate key generation: PCG64 draws both key halves in one call
+            keys = _RNG.integers(0, q, size=(2, N), dtype=np.uint32)
+        return (time.perf_counter_ns() - start_time) / 1e9 / self.benchmark_iterations
         
     def _benchmark_hash_operations(self) -> float:
         """Benchmark hash operation performance."""
-        start_time = time.time()
-        for _ in range(self.benchmark_iterations):
-            # Simulate hash operations
-            data = np.random.bytes(32)
-            _ = hashlib.sha256(data).digest()
-            _ = hashlib.shake_256(data).digest(64)
-        return (time.time() - start_time) / self.benchmark_iterations
+        # Simulate hash operations over one pre-drawn batch of 32-byte inputs
+        data = secrets.token_bytes(32 * self.benchmark_iterations)
+        view = memoryview(data)
+        shake_base = hashlib.shake_256()
+        start_time = time.perf_counter_ns()
+        _ = sha256_batch(data, 32)
+        for i in range(0, len(view), 32):
+            # Clone a ready hasher instead of constructing a new context per input
+            h = shake_base.copy()
+            h.update(view[i:i + 32])
+            _ = h.digest(64)
+        return (time.perf_counter_ns() - start_time) / 1e9 / self.benchmark_iterations
         
     def _compare_with_competitors(self, our_results: Dict[str, float]) -> None:
         """Compare our performance with Fiat-Shamir and Falcon."""
@@ -95,9 +135,15 @@ class PerformanceSecurity:
             for operation, our_time in our_results.items():
                 fiat_time = fiat_shamir_results[operation]
                 falcon_time = falcon_results[operation]
+                self.our_times[operation].push(our_time)
+                self.fiat_shamir_times[operation].push(fiat_time)
+                self.falcon_times[operation].push(falcon_time)
                 
                 print(f"\n{operation}:")
                 print(f"Our implementation: {our_time:.6f}s")
+                stat = self.our_times[operation]
+                if stat.n > 1:
+                    print(f"Running mean over {stat.n} runs: {stat.mean:.6f}s (std {stat.var ** 0.5:.6f}s)")
                 print(f"Fiat-Shamir: {fiat_time:.6f}s")
                 print(f"Falcon: {falcon_time:.6f}s")
                 
@@ -1,7 +1,9 @@
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Union
 from utils.params import N, q
 import hashlib
+import heapq
+import hmac
 import time
 
 class ProtocolSecurity:
@@ -9,6 +11,8 @@ class ProtocolSecurity:
         self.max_proof_age = 300  # 5 minutes in seconds
         self.max_parallel_sessions = 10
         self.active_sessions = {}
+        # Min-heap of (start_time, session_id); oldest session is always at [0]
+        self._session_heap = []
         
     def check_proof_freshness(self, proof: Dict[str, Any]) -> bool:
         """Check if the proof is fresh and not replayed."""
@@ -34,12 +38,14 @@ class ProtocolSecurity:
     def check_parallel_session(self, session_id: str) -> bool:
         """Check for parallel session attacks."""
         try:
-            # Clean up old sessions
+            # Clean up old sessions, popping only expired entries off the heap head
             current_time = time.time()
-            self.active_sessions = {
-                sid: ts for sid, ts in self.active_sessions.items()
-                if current_time - ts < self.max_proof_age
-            }
+            heap = self._session_heap
+            while heap and current_time - heap[0][0] >= self.max_proof_age:
+                ts, sid = heapq.heappop(heap)
+                # Skip stale entries for sessions that were re-registered later
+                if self.active_sessions.get(sid) == ts:
+                    del self.active_sessions[sid]
             
             # Check if we've exceeded max parallel sessions
             if len(self.active_sessions) >= self.max_parallel_sessions:
@@ -48,6 +54,7 @@ class ProtocolSecurity:
                 
             # Add new session
             self.active_sessions[session_id] = current_time
+            heapq.heappush(heap, (current_time, session_id))
             print("✓ Parallel session check passed")
             return True
             
@@ -77,15 +84,27 @@ class ProtocolSecurity:
             print(f"Error in protocol flow check: {str(e)}")
             return False
             
-    def check_message_integrity(self, proof: Dict[str, Any], original_message: bytes) -> bool:
-        """Verify message integrity throughout the protocol."""
+    def check_message_integrity(self, proof: Dict[str, Any],
+                                original_message: Union[bytes, bytearray, memoryview, Iterable[bytes]]) -> bool:
+        """Verify message integrity throughout the protocol; the message may be streamed in chunks."""
         try:
             if 'message_hash' not in proof:
                 print("❌ Missing message hash")
                 return False
                 
-            computed_hash = hashlib.sha256(original_message).digest()
-            if proof['message_hash'] != computed_hash:
+            h = hashlib.sha256()
+            if isinstance(original_message, (bytes, bytearray, memoryview)):
+                h.update(original_message)
+            else:
+                for chunk in original_message:
+                    h.update(chunk)
+            computed_hash = h.digest()
+            message_hash = proof['message_hash']
+            if not isinstance(message_hash, (bytes, bytearray)):
+                print("❌ Message hash must be a raw digest")
+                return False
+            # Constant-time comparison: no early exit on the first differing byte
+            if not hmac.compare_digest(message_hash, computed_hash):
                 print("❌ Message integrity check failed")
                 return False
                 
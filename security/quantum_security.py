@@ -1,13 +1,11 @@
 import numpy as np
 from typing import Dict, Any, List
-from utils.params import N, q
+from utils.params import N, q, SC
 import hashlib
 import random
 
 class QuantumSecurity:
     def __init__(self):
-        self.grover_threshold = 2**(N//2)  # Grover's algorithm resistance
-        self.shor_threshold = 2**(N//3)    # Shor's algorithm resistance
         self.quantum_random_oracle = hashlib.shake_256
         
     def check_grover_resistance(self, proof: Dict[str, Any]) -> bool:
@@ -16,7 +14,7 @@ class QuantumSecurity:
             # Check if the search space is large enough
             if 's' in proof:
                 s = proof['s']
-                if len(s) < self.grover_threshold:
+                if len(s) < SC.grover_threshold:
                     print("❌ Insufficient resistance against Grover's algorithm")
                     return False
                     
@@ -40,12 +38,12 @@ class QuantumSecurity:
             # Check if the polynomial degree is large enough
             if 's' in proof:
                 s = proof['s']
-                if len(s) < self.shor_threshold:
+                if len(s) < SC.shor_threshold:
                     print("❌ Insufficient resistance against Shor's algorithm")
                     return False
                     
             # Check if the modulus is large enough
-            if q < 2**2048:  # Minimum modulus size for quantum resistance
+            if q < SC.min_quantum_modulus:
                 print("❌ Modulus size not quantum-resistant")
                 return False
                 
@@ -58,7 +56,7 @@ class QuantumSecurity:
             
     def quantum_random_oracle_hash(self, data: bytes) -> bytes:
         """Use quantum-resistant hash function."""
-        return self.quantum_random_oracle(data).digest(64)  # 512-bit output
+        return self.quantum_random_oracle(data).digest(SC.shake_bytes)
         
     def check_quantum_random_oracle(self, proof: Dict[str, Any]) -> bool:
         """Verify quantum random oracle properties."""
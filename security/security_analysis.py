@@ -1,7 +1,44 @@
 import numpy as np
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple
-import matplotlib.pyplot as plt
 from datetime import datetime
+from utils.params import N, HYPERBOLA_TOL
+
+def _write_svg_bar(results: Dict[str, float], path: str) -> None:
+    """Write the scores as a plain SVG bar chart (no plotting backend needed)."""
+    bar_w, gap, height, top, bottom = 60, 20, 300, 30, 90
+    width = gap + len(results) * (bar_w + gap)
+    scale = height / 1.1
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{top + height + bottom}">',
+        f'<text x="{width / 2}" y="20" text-anchor="middle" font-size="14">Security Analysis Results</text>',
+    ]
+    for i, (component, score) in enumerate(results.items()):
+        x = gap + i * (bar_w + gap)
+        h = max(score, 0.0) * scale
+        y = top + height - h
+        parts.append(f'<rect x="{x}" y="{y:.1f}" width="{bar_w}" height="{h:.1f}" fill="#1f77b4"/>')
+        parts.append(f'<text x="{x + bar_w / 2}" y="{y - 4:.1f}" text-anchor="middle" font-size="11">{score:.2f}</text>')
+        parts.append(f'<text x="{x + bar_w / 2}" y="{top + height + 14}" text-anchor="end" font-size="11" '
+                     f'transform="rotate(-45 {x + bar_w / 2} {top + height + 14})">{component}</text>')
+    parts.append('</svg>')
+    with open(path, 'w') as f:
+        f.write('\n'.join(parts))
+
+_worker_generator = None
+
+def _timed_keygen() -> int:
+    """Time one key generation in a worker process (generator built once per worker)."""
+    global _worker_generator
+    if _worker_generator is None:
+        from keygen.keygen import AdvancedKeyGenerator
+        _worker_generator = AdvancedKeyGenerator()
+    start = time.perf_counter_ns()
+    _worker_generator.generate_advanced_keys()
+    return time.perf_counter_ns() - start
 
 class SecurityAnalyzer:
     def __init__(self):
@@ -15,8 +52,8 @@ class SecurityAnalyzer:
         issues = []
         
         try:
-            from utils.ntt import ntt, intt
-            from utils.params import N, q, root_of_unity
+            from utils.ntt import ntt, intt, OMEGA
+            from utils.params import N, q
             
             # Check parameter security
             if N < 512:
@@ -26,9 +63,10 @@ class SecurityAnalyzer:
                 issues.append("Modulus q too small for security")
                 security_score -= 0.2
             
-            # Check root of unity properties
-            if pow(root_of_unity, N, q) != 1:
-                issues.append("Invalid root of unity")
+            # Check the root the transform actually uses: N is a power of two, so
+            # w is a primitive Nth root iff w^N = 1 and w^(N/2) = -1 (mod q)
+            if pow(OMEGA, N, q) != 1 or pow(OMEGA, N // 2, q) != q - 1:
+                issues.append("Not a primitive Nth root of unity")
                 security_score -= 0.3
             
             security_score += 1.0
@@ -73,7 +111,7 @@ class SecurityAnalyzer:
         issues = []
         
         try:
-            from commitment.lattice_commit import compute_hyperbola_points
+            from commitment.lattice_commit import compute_hyperbola_points, hyperbola_residual
             
             # Test hyperbola computation
             a, b = 2.0, 3.0
@@ -81,13 +119,13 @@ class SecurityAnalyzer:
             
             # Check horizontal hyperbola
             x_horiz, y_horiz = compute_hyperbola_points(x, a, b, is_horizontal=True)
-            if not np.allclose(x_horiz**2/a**2 - y_horiz**2/b**2, 1, atol=1e-6):
+            if not hyperbola_residual(x_horiz, y_horiz, a**2, b**2, HYPERBOLA_TOL) <= HYPERBOLA_TOL:
                 issues.append("Horizontal hyperbola computation error")
                 security_score -= 0.2
             
             # Check vertical hyperbola
             x_vert, y_vert = compute_hyperbola_points(x, a, b, is_horizontal=False)
-            if not np.allclose(y_vert**2/a**2 - x_vert**2/b**2, 1, atol=1e-6):
+            if not hyperbola_residual(y_vert, x_vert, a**2, b**2, HYPERBOLA_TOL) <= HYPERBOLA_TOL:
                 issues.append("Vertical hyperbola computation error")
                 security_score -= 0.2
             
@@ -105,19 +143,17 @@ class SecurityAnalyzer:
         
         try:
             # Check for constant-time operations
-            from keygen.keygen import AdvancedKeyGenerator
             from signing.sign import sign_message
             
-            # Test key generation timing
-            generator = AdvancedKeyGenerator()
-            times = []
-            for _ in range(100):
-                start = time.time()
-                generator.generate_advanced_keys()
-                times.append(time.time() - start)
-            
-            # Check timing variation
-            if np.std(times) > 0.1:  # More than 100ms variation
+            # Test key generation timing across worker processes (the generator
+            # is not picklable, so each worker builds its own)
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                futs = [ex.submit(_timed_keygen) for _ in range(100)]
+                times = np.array([f.result() for f in futs], dtype=np.int64)
+            
+            # Check timing variation (10th-90th percentile spread resists GC-pause outliers)
+            p10, p90 = np.percentile(times, [10, 90])
+            if p90 - p10 > 100_000_000:  # More than 100ms variation
                 issues.append("Significant timing variation detected")
                 security_score -= 0.3
             
@@ -189,6 +225,12 @@ class SecurityAnalyzer:
 
     def plot_results(self):
         """Generate visualization of security analysis results"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Headless/CI runs get a hand-written SVG; matplotlib only for interactive use
+        if os.environ.get('CI') or not sys.stdout.isatty():
+            _write_svg_bar(self.results, f'security/analysis_{timestamp}.svg')
+            return
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(10, 6))
         
         components = list(self.results.keys())
@@ -201,7 +243,6 @@ class SecurityAnalyzer:
         plt.ylim(0, 1.1)
         
         plt.tight_layout()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         plt.savefig(f'security/analysis_{timestamp}.png')
         plt.close()
 
@@ -0,0 +1,28 @@
+# security/test_parameter_security.py
+
+import pytest
+import security.parameter_security as parameter_security
+from security.parameter_security import ParameterSecurity
+
+TWO_64 = 1 << 64
+# 2^64 - 59 is the largest prime below 2^64 and 2^64 + 13 the smallest above
+PRIMES = [TWO_64 - 59, TWO_64 + 13, 4294967291, 4294967279]
+COMPOSITES = [TWO_64 - 1, TWO_64, TWO_64 + 1, TWO_64 - 57,
+              4294967291 * 4294967279, 4294967291 * 4294967311]
+
+@pytest.fixture(params=["gmpy2", "pure"])
+def checker(request, monkeypatch):
+    # Run the big-modulus branch both with and without gmpy2
+    if request.param == "pure":
+        monkeypatch.setattr(parameter_security, "gmpy2", None)
+    elif parameter_security.gmpy2 is None:
+        pytest.skip("gmpy2 not installed")
+    return ParameterSecurity()
+
+@pytest.mark.parametrize("n", PRIMES)
+def test_is_prime_accepts_primes_near_2_64(checker, n):
+    assert checker._is_prime(n)
+
+@pytest.mark.parametrize("n", COMPOSITES)
+def test_is_prime_rejects_composites_near_2_64(checker, n):
+    assert not checker._is_prime(n)
@@ -3,173 +3,248 @@
 
 import os
 import numpy as np
+from dataclasses import dataclass
 import time
 import hmac
 import hashlib
-from typing import Dict, Any, Tuple
-from commitment.commit import create_commitment
-from hash.sha_utils import shake256_hash
-from challenge.four_challenges import respond_to_challenge as handle_challenge
-from utils.ntt import ntt, intt
-from utils.params import N, q, GAUSSIAN_STDDEV
-from utils.gaussian import constant_time_gaussian
-import random
+from typing import Dict, Any, Tuple, Optional, Union, List
+from commitment.lattice_commit import lattice_commitment_digest
+from hash.sha_utils import shake256_hash, commitment_digest
+from challenge.four_challenges import respond_to_challenge as handle_challenge, generate_commitment_for_challenge
+from utils.ntt import ntt, intt, ntt_inplace, intt_inplace, psi_table_bitrev, barrett
+from utils.params import N, q, root_of_unity, GAUSSIAN_STDDEV, COEFF_DTYPE
+from utils.gaussian import gaussian_batch
 import sys
-from keygen.keygen import sample_poly_advanced
+from keygen.keygen import sample_poly_advanced, precomputed_inverses
 import math
 
 class SigningError(Exception):
     """Custom exception for signing errors."""
     pass
 
-def sign_message(message: str, private_key: dict, challenge_type: str, public_key: dict = None, nonce: bytes = None) -> dict:
+# Twiddles for constant_time_poly_mult: a length-2N negacyclic NTT never wraps the
+# product of two length-N polys, so the cyclic product is the sum of its two halves
+_MULT_PSI = pow(root_of_unity, (q - 1) // (4 * N), q)
+_MULT_PSI_TABLE = psi_table_bitrev(_MULT_PSI, q, 2 * N)
+_MULT_PSI_INV_TABLE = psi_table_bitrev(pow(_MULT_PSI, -1, q), q, 2 * N)
+_MULT_N_INV = pow(2 * N, -1, q)
+
+_SHA256 = hashlib.sha256
+
+@dataclass(slots=True)
+class PrivateKey:
+    """Signing key with fixed fields; built once from the keygen dict."""
+    f: np.ndarray
+    g: np.ndarray
+    q: int
+    h: Optional[int] = None
+    k: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, key: Dict[str, Any]) -> 'PrivateKey':
+        return cls(
+            f=np.asarray(key['f'], dtype=COEFF_DTYPE),
+            g=np.asarray(key['g'], dtype=COEFF_DTYPE),
+            q=key['params']['q'],
+            h=key.get('h'),
+            k=key.get('k'),
+        )
+
+@dataclass(slots=True)
+class PublicKey:
+    """Verification key with fixed fields; built once from the keygen dict."""
+    h_pub: Optional[np.ndarray] = None
+    q: Optional[int] = None
+    v: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, key: Dict[str, Any]) -> 'PublicKey':
+        h_pub = key.get('h_pub')
+        return cls(
+            h_pub=None if h_pub is None else np.asarray(h_pub, dtype=COEFF_DTYPE),
+            q=key.get('params', {}).get('q'),
+            v=key.get('v'),
+        )
+
+def sign_message(message: str, private_key: Union[PrivateKey, dict], challenge_type: str,
+                 public_key: Union[PublicKey, dict, None] = None, nonce: Optional[bytes] = None) -> dict:
     """Sign a message using efficient, in-place numpy operations and minimal recomputation."""
     try:
-        if not isinstance(message, str) or not isinstance(private_key, dict):
+        if not isinstance(message, str) or not isinstance(private_key, (PrivateKey, dict)):
             raise SigningError("Invalid input types")
-        n = private_key['params']['q']
-        # Use numpy arrays for all polynomials
-        f = np.array(private_key['f'], dtype=np.int64)
-        g = np.array(private_key['g'], dtype=np.int64)
-        # Use in-place operations for blinding (if needed)
-        f += np.random.randint(-3, 4, size=f.shape)
-        g += np.random.randint(-3, 4, size=g.shape)
-        # Only compute what is needed for the challenge
-        public_params = {'n': n}
-        if public_key and 'v' in public_key:
-            public_params['v'] = public_key['v']
-        secret_data = {}  # Fill as needed
-        # Prepare all required arguments for create_commitment
-        from utils.params import N, q
-        # Generate protocol-accurate commitment values
-        from challenge.four_challenges import generate_commitment_for_challenge
-        commitment_params = generate_commitment_for_challenge(challenge_type, public_params)
-        # x, y, randomness as arrays of length N
-        x = np.full(N, commitment_params['x'])
-        y = np.full(N, commitment_params['y'])
-        randomness = np.full(N, commitment_params['r'])
-        a = commitment_params['a']
-        b = commitment_params['b']
-        private_key_point = (commitment_params['h'], commitment_params['k'])
-        public_key_point = (commitment_params['v'], commitment_params['k'])  # Adjust as needed for your protocol
-        commitment = create_commitment(x, y, randomness, a, b, private_key_point, public_key_point)
-        response = handle_challenge(challenge_type, commitment, secret_data, public_params)
-        signature = {
-            'challenge_type': challenge_type,
-            'message_hash': hashlib.sha256(message.encode()).hexdigest(),
-            'commitment': commitment,
-            'response': response
-        }
-        return signature
+        if isinstance(private_key, dict):
+            private_key = PrivateKey.from_dict(private_key)
+        if isinstance(public_key, dict):
+            public_key = PublicKey.from_dict(public_key)
+        msg_hash = _SHA256(message.encode()).hexdigest()
+        return _sign_prepared(msg_hash, private_key, challenge_type, public_key)
     except Exception as e:
         raise SigningError(f"Signing failed: {str(e)}")
 
+def sign_batch(messages: List[str], private_key: Union[PrivateKey, dict], challenge_type: str,
+               public_key: Union[PublicKey, dict, None] = None) -> List[dict]:
+    """Sign several messages, validating and converting the keys once for the whole batch."""
+    try:
+        if not all(isinstance(m, str) for m in messages) or not isinstance(private_key, (PrivateKey, dict)):
+            raise SigningError("Invalid input types")
+        if isinstance(private_key, dict):
+            private_key = PrivateKey.from_dict(private_key)
+        if isinstance(public_key, dict):
+            public_key = PublicKey.from_dict(public_key)
+        hashes = [_SHA256(m.encode()).hexdigest() for m in messages]
+        return [_sign_prepared(h, private_key, challenge_type, public_key) for h in hashes]
+    except Exception as e:
+        raise SigningError(f"Batch signing failed: {str(e)}")
+
+def _sign_prepared(msg_hash: str, private_key: PrivateKey, challenge_type: str,
+                   public_key: Optional[PublicKey]) -> dict:
+    """Signing core shared by sign_message and sign_batch; inputs are already validated."""
+    # Only compute what is needed for the challenge
+    public_params = {'n': private_key.q}
+    if public_key is not None and public_key.v is not None:
+        public_params['v'] = public_key.v
+    secret_data = {}  # Fill as needed
+    # Generate protocol-accurate commitment values
+    commitment_params = generate_commitment_for_challenge(challenge_type, public_params)
+    response = handle_challenge(challenge_type, commitment_params, secret_data, public_params)
+    signature = {
+        'challenge_type': challenge_type,
+        'message_hash': msg_hash,
+        'response': response
+    }
+    signature.update(_CHALLENGE_SIGNERS[challenge_type](commitment_params))
+    return signature
+
+def _lattice_commitment(params: Dict[str, Any]) -> str:
+    """Hash of the lattice commitment over the challenge values; no hyperbola layers or graphs."""
+    # x, y, randomness as arrays of length N
+    x = np.full(N, params['x'])
+    y = np.full(N, params['y'])
+    randomness = np.full(N, params['r'])
+    return lattice_commitment_digest(x, y, randomness)
+
+def _fs_digest(params: Dict[str, Any]) -> str:
+    """Binding hash over the Fiat-Shamir values; reveals none of them."""
+    return commitment_digest([params['s']], [params['r']], params['x'], params['y'], params['h'], params['k'])
+
+def _sign_00(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Challenge 00 publishes the hash and x, which the verifier squares y against."""
+    return {'commitment': {'commitment': _fs_digest(params), 'x': params['x']}}
+
+def _sign_01(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Challenge 01 publishes the lattice commitment hash and y."""
+    return {'commitment': {'commitment': _lattice_commitment(params), 'y': params['y']}}
+
+def _sign_10(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Challenge 10 publishes the lattice commitment hash and x."""
+    return {'commitment': {'commitment': _lattice_commitment(params), 'x': params['x']}}
+
+def _sign_11(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Challenge 11 publishes only the hash; the response carries x, y and v."""
+    return {'commitment': {'commitment': _fs_digest(params)}}
+
+_CHALLENGE_SIGNERS = {'00': _sign_00, '01': _sign_01, '10': _sign_10, '11': _sign_11}
+
 def constant_time_poly_mult(a: list, b: list, max_coeff: int = 3) -> list:
     """Constant-time polynomial multiplication with strict coefficient bounds."""
-    result = [0] * N
-    for i in range(N):
-        for j in range(N):
-            k = (i + j) % N
-            # Multiply and reduce immediately
-            temp = (a[i] * b[j]) % q
-            # Center around zero
-            if temp > q//2:
-                temp -= q
-            
-            # Add to result and reduce immediately
-            result[k] = (result[k] + temp) % q
-            # Center around zero
-            if result[k] > q//2:
-                result[k] -= q
-            
-            # Enforce coefficient bound based on max_coeff
-            while result[k] > max_coeff:
-                result[k] -= q
-            while result[k] < -max_coeff:
-                result[k] += q
-    
-    # Final reduction pass to ensure all coefficients are within bounds
-    for i in range(N):
-        while result[i] > max_coeff:
-            result[i] -= q
-        while result[i] < -max_coeff:
-            result[i] += q
-    
-    return result
+    # Cyclic product mod (X^N - 1, q) via NTT: zero-pad to 2N, pointwise multiply, fold
+    a_ntt = np.zeros(2 * N, dtype=COEFF_DTYPE)
+    b_ntt = np.zeros(2 * N, dtype=COEFF_DTYPE)
+    a_ntt[:N] = np.asarray(a, dtype=np.int64) % q
+    b_ntt[:N] = np.asarray(b, dtype=np.int64) % q
+    ntt_inplace(a_ntt, _MULT_PSI_TABLE, q)
+    ntt_inplace(b_ntt, _MULT_PSI_TABLE, q)
+    c = intt_inplace(barrett(a_ntt.astype(np.int64) * b_ntt), _MULT_PSI_INV_TABLE, _MULT_N_INV, q)
+    result = (c[:N] + c[N:]) % q
+    # Representative in [-max_coeff, q - max_coeff), as the old centering and bound loops produced
+    return ((result + max_coeff) % q - max_coeff).tolist()
 
 def constant_time_poly_add(a: list, b: list, max_coeff: int = 3) -> list:
     """Constant-time polynomial addition with strict coefficient bounds."""
-    result = [0] * N
-    for i in range(N):
-        # Add and reduce immediately
-        result[i] = (a[i] + b[i]) % q
-        # Center around zero
-        if result[i] > q//2:
-            result[i] -= q
-        
-        # Enforce coefficient bound
-        while result[i] > max_coeff:
-            result[i] -= q
-        while result[i] < -max_coeff:
-            result[i] += q
-    
-    return result
+    a = np.asarray(a, dtype=np.int64)[:N]
+    b = np.asarray(b, dtype=np.int64)[:N]
+    # One closed-form reduction into [-max_coeff, q - max_coeff), no data-dependent loops
+    return ((a + b + max_coeff) % q - max_coeff).tolist()
 
-def sanitize_poly(poly):
+def sanitize_poly(poly: list) -> list:
     """Sanitize polynomial coefficients to ensure they're in the correct range."""
-    return [int(x) % q for x in poly]
+    return (np.asarray(poly, dtype=np.int64) % q).tolist()
 
-def sanitize_basis(basis):
+def sanitize_basis(basis: np.ndarray) -> np.ndarray:
     """Sanitize basis vectors to ensure they're valid."""
-    if not isinstance(basis, np.ndarray) or basis.shape != (2, N):
+    if not isinstance(basis, np.ndarray):
+        raise SigningError("Invalid basis format")
+    arr = np.asarray(basis, dtype=np.int64)
+    if arr.shape != (2, N):
         raise SigningError("Invalid basis format")
-    return np.array([sanitize_poly(b) for b in basis])
+    # One reduction over the whole 2 x N block
+    return arr % q
 
 def sample_random_poly_secure() -> list:
     """Sample a random polynomial with small coefficients."""
-    poly = []
-    for _ in range(N):
-        # Use secure random to choose between -1, 0, 1
-        r = int.from_bytes(os.urandom(4), 'little') % 3
-        if r == 2:
-            r = -1
-        poly.append(r)
-    return poly
+    # One urandom call for all N little-endian 32-bit draws, mapped to -1, 0, 1
+    vals = (np.frombuffer(os.urandom(4 * N), dtype='<u4') % 3).astype(np.int64)
+    return np.where(vals == 2, -1, vals).tolist()
 
 def sample_gaussian_poly_secure() -> list:
     """Sample from discrete Gaussian with side-channel protection."""
-    poly = []
-    for _ in range(N):
-        # Use multiple samples and combine them
-        s1 = constant_time_gaussian()
-        s2 = constant_time_gaussian()
-        poly.append((s1 + s2) % q)
-    return poly
-
-def compute_public_key_secure(f, g):
+    # Use multiple samples and combine them, drawn for all N coefficients at once
+    s = gaussian_batch(2 * N).reshape(2, N)
+    return ((s[0] + s[1]) % q).tolist()
+
+def batch_invert(vals: list) -> np.ndarray:
+    """Montgomery batch inversion mod q: one pow(_, -1, q) plus 3(n-1) multiplies."""
+    vals = np.asarray(vals, dtype=np.int64).tolist()  # plain ints for the scalar loop
+    n = len(vals)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    prefix = [0] * n
+    acc = 1
+    for i in range(n):
+        # One non-invertible element would zero every later prefix, so reject it here
+        if vals[i] % q == 0:
+            raise ValueError(f"Element {i} is not invertible mod {q}")
+        acc = (acc * vals[i]) % q
+        prefix[i] = acc
+    inv = pow(acc, -1, q)
+    out = np.empty(n, dtype=np.int64)
+    for i in range(n - 1, 0, -1):
+        out[i] = (inv * prefix[i - 1]) % q
+        inv = (inv * vals[i]) % q
+    out[0] = inv
+    return out
+
+def compute_public_key_secure(f: list, g: list) -> np.ndarray:
     """Compute public key with side-channel protection."""
     f_ntt = ntt(f)
     g_ntt = ntt(g)
-    h_ntt = []
-    for i in range(N):
-        h_ntt.append((g_ntt[i] * pow(f_ntt[i], -1, q)) % q)
+    h_ntt = barrett(g_ntt * batch_invert(f_ntt))
     return intt(h_ntt)
 
-def constant_time_invert(a, q):
+# Inverses for the parameter modulus come from keygen's table (q is prime)
+_INV_TABLE_Q = q
+
+def constant_time_invert(a: int, q: int) -> int:
     """Constant-time modular inversion."""
     if a == 0:
         return 0
+    if q == _INV_TABLE_Q:
+        r = a % q
+        # Other multiples of q have no inverse; raise as pow(a, -1, q) does
+        if r == 0:
+            raise ValueError("base is not invertible for the given modulus")
+        # One table read instead of an extended-GCD loop
+        return int(precomputed_inverses[r - 1])
     return pow(a, -1, q)
 
 def create_commitment_secure(s: list, r: list, x: int, y: int, h: int, k: int, a: int, b: int) -> Dict[str, Any]:
     """Create a secure commitment with small coefficients."""
     try:
         # Generate extra randomness for security
-        extra_randomness = [random.randint(-1, 1) for _ in range(N)]
+        extra_randomness = sample_random_poly_secure()
         
-        # Create commitment data
-        data = f"{s}|{extra_randomness}|{x}|{y}|{h}|{k}".encode()
-        commitment_hash = hashlib.sha256(data).hexdigest()
+        # Hash the commitment data from its raw buffers
+        commitment_hash = commitment_digest(s, extra_randomness, x, y, h, k)
         
         return {
             'commitment': commitment_hash,
@@ -182,7 +257,7 @@ def create_commitment_secure(s: list, r: list, x: int, y: int, h: int, k: int, a
     except Exception:
         raise SigningError("Commitment creation failed")
 
-def compute_line_equation(point1, point2):
+def compute_line_equation(point1: tuple, point2: tuple) -> tuple:
     """Compute line equation between two points."""
     x1, y1 = point1
     x2, y2 = point2
@@ -205,7 +280,7 @@ def compute_hyperbola_points(x: int, a: int, b: int, h: int, k: int, is_horizont
                 # Ensure x is outside the hyperbola's vertex
                 x = h + a + 1
                 x_shifted = a + 1
-            y = k + b * np.sqrt((x_shifted**2 / a**2) - 1)
+            y = k + b * math.sqrt((x_shifted**2 / a**2) - 1)
             return x, int(y)
         else:
             # For vertical hyperbola: (y-k)²/a² - (x-h)²/b² = 1
@@ -215,7 +290,7 @@ def compute_hyperbola_points(x: int, a: int, b: int, h: int, k: int, is_horizont
                 # Ensure y is outside the hyperbola's vertex
                 y = k + a + 1
                 y_shifted = a + 1
-            x = h + b * np.sqrt((y_shifted**2 / a**2) - 1)
+            x = h + b * math.sqrt((y_shifted**2 / a**2) - 1)
             return int(x), y
     except Exception:
         raise SigningError("Hyperbola point computation failed")
@@ -0,0 +1,63 @@
+# signing/test_sign.py
+
+import numpy as np
+import pytest
+from signing.sign import (PrivateKey, batch_invert, constant_time_invert,
+                          constant_time_poly_mult, sign_message)
+from verification.verify import verify_signature
+from utils.params import N, q
+
+MESSAGE = "Hello, Hypermaze Beast Mode!"
+
+def _keys():
+    private_key = PrivateKey(f=np.ones(N, dtype=np.int16), g=np.ones(N, dtype=np.int16), q=q)
+    public_key = {'params': {'q': q}}
+    return private_key, public_key
+
+@pytest.mark.parametrize("challenge_type", ['00', '01', '10', '11'])
+def test_signature_publishes_only_public_commitment(challenge_type):
+    private_key, _ = _keys()
+    signature = sign_message(MESSAGE, private_key, challenge_type)
+    assert set(signature) == {'challenge_type', 'message_hash', 'commitment', 'response'}
+    # The prover's s, r, h, k, a, b and v never leave the signer through the commitment
+    assert set(signature['commitment']) <= {'commitment', 'x', 'y'}
+    assert isinstance(signature['commitment']['commitment'], str)
+
+@pytest.mark.parametrize("challenge_type", ['00', '01', '10', '11'])
+def test_signature_verifies(challenge_type):
+    private_key, public_key = _keys()
+    signature = sign_message(MESSAGE, private_key, challenge_type)
+    assert verify_signature(MESSAGE.encode(), signature, public_key)
+
+def test_constant_time_invert_matches_pow():
+    for a in (1, 2, 5, q - 1, q + 7, -3):
+        assert constant_time_invert(a, q) == pow(a, -1, q)
+    assert constant_time_invert(0, q) == 0
+    with pytest.raises(ValueError):
+        constant_time_invert(2 * q, q)
+
+def test_batch_invert():
+    vals = [1, 2, 5, q - 1, q + 7, -3]
+    assert batch_invert(vals).tolist() == [pow(v, -1, q) for v in vals]
+    assert batch_invert([]).shape == (0,)
+    for bad in ([3, 0, 5], [3, q, 5]):
+        with pytest.raises(ValueError):
+            batch_invert(bad)
+
+def _schoolbook_cyclic(a, b):
+    """Product mod (X^N - 1, q), one coefficient pair at a time."""
+    c = [0] * N
+    for i in range(N):
+        for j in range(N):
+            c[(i + j) % N] += int(a[i]) * int(b[j])
+    return [x % q for x in c]
+
+@pytest.mark.parametrize("max_coeff", [1, 3])
+def test_constant_time_poly_mult_matches_schoolbook(max_coeff):
+    rng = np.random.default_rng(max_coeff)
+    a = rng.integers(-q, q, N)
+    b = rng.integers(-3, 4, N)
+    got = constant_time_poly_mult(a.tolist(), b.tolist(), max_coeff)
+    # Same residues, each in [-max_coeff, q - max_coeff)
+    assert [x % q for x in got] == _schoolbook_cyclic(a, b)
+    assert all(-max_coeff <= x < q - max_coeff for x in got)
@@ -10,8 +10,18 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from commitment.lattice_commit import create_lattice_commitment, verify_lattice_commitment
 from utils.params import N, q
-from utils.ntt import ntt, intt
-from hash.sha_utils import shake256_hash
+from utils.ntt import ntt_ct, ntt_batch, intt_gs
+from hash.sha_utils import poly_digest
+
+# NTTs of the fixed test inputs, computed once and shared by every challenge run
+_ntt_cache = {}
+
+def _cached_ntt(*arrays):
+    key = tuple((a.dtype.str, a.tobytes()) for a in arrays)
+    if key not in _ntt_cache:
+        # One batched transform over all inputs on a miss
+        _ntt_cache[key] = ntt_batch(np.stack(arrays))
+    return _ntt_cache[key]
 
 def test_verification_process(challenge_type='01'):
     # Test parameters
@@ -47,18 +57,18 @@ def test_verification_process(challenge_type='01'):
     # 2. Main commitment verification
     print("\nStep 2: Main Commitment Verification")
     print(f"Computing commitment...")
-    x_ntt = ntt(x)
-    y_ntt = ntt(y)
-    r_ntt = ntt(randomness)
-    error_ntt = ntt(error)
-    computed_commitment_ntt = [(x_ntt[i] * r_ntt[i] + y_ntt[i] + error_ntt[i]) % q for i in range(N)]
-    computed_commitment = intt(computed_commitment_ntt)
+    # Operands stay in bit-reversed NTT order end to end, so neither
+    # transform needs a reorder pass
+    x_ntt, y_ntt, r_ntt = _cached_ntt(x, y, randomness)
+    error_ntt = ntt_ct(error)
+    computed_commitment_ntt = (x_ntt * r_ntt + y_ntt + error_ntt) % q
+    computed_commitment = intt_gs(computed_commitment_ntt)
     print(f"Status: {'✓ PASSED' if np.array_equal(computed_commitment, commitment['commitment_poly']) else '❌ FAILED'}")
     
     # 3. Hash verification
     print("\nStep 3: Hash Verification")
     print(f"Computing commitment hash...")
-    computed_hash = shake256_hash(str(computed_commitment).encode())
+    computed_hash = poly_digest(computed_commitment)
     print(f"Status: {'✓ PASSED' if computed_hash == commitment['commitment'] else '❌ FAILED'}")
     
     # 4. Hyperbola verification
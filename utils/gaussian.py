@@ -1,15 +1,42 @@
 # utils/gaussian.py
 
-import random
-import math
+import os
+import numpy as np
 from utils.params import GAUSSIAN_STDDEV
 
+_RNG = np.random.default_rng()
+_BLOCK = 4096
+
+def gaussian_batch(n, mu=0, sigma=GAUSSIAN_STDDEV):
+    """n rounded normal samples with |v| <= 6*sigma, drawn and tail-rejected as whole arrays."""
+    out = np.empty(0, dtype=np.int64)
+    while out.shape[0] < n:
+        k = int((n - out.shape[0]) * 1.05) + 1
+        v = np.rint(_RNG.normal(mu, sigma, k)).astype(np.int64)
+        out = np.concatenate((out, v[np.abs(v) <= 6 * sigma]))
+    return out[:n]
+
+# Default-parameter samples for the scalar API, filled on first use and a block at a time
+_buf = np.empty(0, dtype=np.int64)
+_pos = 0
+
+def _reseed_after_fork():
+    """Give a forked child its own generator and drop the samples it inherited."""
+    global _RNG, _buf, _pos
+    _RNG = np.random.default_rng()
+    _buf = np.empty(0, dtype=np.int64)
+    _pos = 0
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
 def constant_time_gaussian(mu=0, sigma=GAUSSIAN_STDDEV):
-    # Box-Muller transform (constant-ish time)
-    while True:
-        u1 = random.random()
-        u2 = random.random()
-        z0 = math.sqrt(-2.0 * math.log(u1)) * math.cos(2 * math.pi * u2)
-        val = round(mu + sigma * z0)
-        if abs(val) <= 6 * sigma:
-            return val
+    """One sample from the buffered stream; same distribution as gaussian_batch."""
+    global _buf, _pos
+    if mu != 0 or sigma != GAUSSIAN_STDDEV:
+        return int(gaussian_batch(1, mu, sigma)[0])
+    if _pos == _buf.shape[0]:
+        _buf = gaussian_batch(_BLOCK)
+        _pos = 0
+    _pos += 1
+    return int(_buf[_pos - 1])
@@ -0,0 +1,99 @@
+# utils/miller_rabin.py
+
+import numpy as np
+from numba import njit, uint64, boolean
+
+# Deterministic Miller-Rabin bases for every n < 2^64
+MR_BASES_U64 = np.array([2, 325, 9375, 28178, 450775, 9780504, 1795265022], dtype=np.uint64)
+
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+_TWO = np.uint64(2)
+_SHIFT = np.uint64(32)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+@njit(cache=True)
+def _mul128(a, b):
+    """Full 64x64 -> 128-bit product as (hi, lo), built from 32-bit limbs."""
+    a_lo = a & _MASK32
+    a_hi = a >> _SHIFT
+    b_lo = b & _MASK32
+    b_hi = b >> _SHIFT
+    p0 = a_lo * b_lo
+    p1 = a_lo * b_hi
+    p2 = a_hi * b_lo
+    p3 = a_hi * b_hi
+    mid = (p0 >> _SHIFT) + (p1 & _MASK32) + (p2 & _MASK32)
+    lo = (p0 & _MASK32) | (mid << _SHIFT)
+    hi = p3 + (p1 >> _SHIFT) + (p2 >> _SHIFT) + (mid >> _SHIFT)
+    return hi, lo
+
+@njit(cache=True)
+def _redc(hi, lo, n, n_neg_inv):
+    """Montgomery reduction of hi:lo (< n * 2^64) to (hi:lo) * 2^-64 mod n."""
+    m = lo * n_neg_inv
+    mn_hi, mn_lo = _mul128(m, n)
+    s_lo = lo + mn_lo
+    carry = _ONE if s_lo < lo else _ZERO
+    s_hi = hi + mn_hi
+    overflow = s_hi < hi
+    t = s_hi + carry
+    overflow = overflow or t < s_hi
+    if overflow or t >= n:
+        t -= n
+    return t
+
+@njit(uint64(uint64, uint64, uint64, uint64), cache=True)
+def mulmod_mont(a, b, n, n_neg_inv):
+    """Montgomery product a * b * 2^-64 mod n for odd n."""
+    hi, lo = _mul128(a, b)
+    return _redc(hi, lo, n, n_neg_inv)
+
+@njit(uint64(uint64, uint64, uint64, uint64, uint64), cache=True)
+def powmod_mont(base_m, exp, n, n_neg_inv, one_m):
+    """base^exp in Montgomery form; base_m and one_m are already in Montgomery form."""
+    result = one_m
+    while exp:
+        if exp & _ONE:
+            result = mulmod_mont(result, base_m, n, n_neg_inv)
+        base_m = mulmod_mont(base_m, base_m, n, n_neg_inv)
+        exp >>= _ONE
+    return result
+
+@njit(boolean(uint64), cache=True)
+def is_prime_u64(n):
+    """Deterministic Miller-Rabin for odd n > 37 with no prime factor <= 37."""
+    # -n^-1 mod 2^64 by Newton iteration (each step doubles the correct bits)
+    inv = n
+    for _ in range(5):
+        inv *= _TWO - n * inv
+    n_neg_inv = _ZERO - inv
+
+    # 2^64 mod n, then 2^128 mod n by 64 modular doublings
+    r1 = (_ZERO - n) % n
+    r2 = r1
+    for _ in range(64):
+        r2 = r2 - (n - r2) if r2 >= n - r2 else r2 + r2
+    n_minus_1 = n - _ONE
+    minus_one_m = n - r1
+
+    d = n_minus_1
+    s = 0
+    while (d & _ONE) == _ZERO:
+        d >>= _ONE
+        s += 1
+
+    for a in MR_BASES_U64:
+        if a >= n:
+            continue
+        a_m = mulmod_mont(a, r2, n, n_neg_inv)
+        x = powmod_mont(a_m, d, n, n_neg_inv, r1)
+        if x == r1 or x == minus_one_m:
+            continue
+        for _ in range(s - 1):
+            x = mulmod_mont(x, x, n, n_neg_inv)
+            if x == minus_one_m:
+                break
+        else:
+            return False
+    return True
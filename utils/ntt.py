@@ -1,14 +1,39 @@
 import numpy as np
-from utils.params import q, N, root_of_unity
+from utils.params import q, N, N_INV, root_of_unity
 from numba import njit, prange
-from concurrent.futures import ThreadPoolExecutor
 
 def modinv(x, q):
     return pow(x, -1, q)
 
-def bit_reverse_numpy(a):
-    n = len(a)
-    result = np.array(a, copy=True)
+# Barrett constants: for 0 <= x < q^2 < 2^BARRETT_SHIFT, x*mu fits in int64 and one
+# conditional subtract finishes the reduction
+BARRETT_SHIFT = 2 * q.bit_length()
+BARRETT_MU = (1 << BARRETT_SHIFT) // q
+
+def barrett(x, q=q, mu=BARRETT_MU, sh=BARRETT_SHIFT):
+    """x mod q for int64 arrays with 0 <= x < q^2, using mul-shift-sub instead of division."""
+    t = (x * mu) >> sh
+    r = x - t * q
+    return r - (r >= q) * q
+
+@njit(cache=True, inline='always')
+def _barrett_params(q):
+    """(mu, shift) for Barrett reduction by a runtime modulus q."""
+    sh = 0
+    while (1 << sh) <= q:
+        sh += 1
+    sh *= 2
+    return (1 << sh) // q, sh
+
+@njit(cache=True, inline='always')
+def _barrett_mod(x, q, mu, sh):
+    """x mod q for 0 <= x < q^2, with the constants from _barrett_params."""
+    r = x - ((x * mu) >> sh) * q
+    return r - q if r >= q else r
+
+def _bitrev_permutation(n):
+    """Index array of the length-n bit-reversal permutation (an involution)."""
+    idx = np.arange(n, dtype=np.int32)
     j = 0
     for i in range(1, n):
         bit = n >> 1
@@ -17,133 +42,300 @@ def bit_reverse_numpy(a):
             bit >>= 1
         j ^= bit
         if i < j:
-            result[i], result[j] = result[j], result[i]
-    return result
-
-# Numba JIT-optimized NTT
-@njit(parallel=True, fastmath=True)
-def ntt_numba(a, root_of_unity, q, N):
-    a = np.array(a, dtype=np.int64)
-    # Bit-reversal
-    n = len(a)
-    result = np.empty_like(a)
-    j = 0
-    for i in range(n):
-        result[j] = a[i]
-        bit = n >> 1
-        while j & bit:
-            j ^= bit
-            bit >>= 1
-        j ^= bit
-    a = result
+            idx[i], idx[j] = idx[j], idx[i]
+    return idx
+
+# Computed once at import; every reorder is then a single fancy-indexing gather
+BITREV_IDX = _bitrev_permutation(N)
+
+# The compiled kernels index without bounds checks, so every wrapper below
+# checks shapes first and a wrong length raises instead of corrupting memory
+def _as_poly(a) -> np.ndarray:
+    """a as an int64 array, which must be one length-N polynomial."""
+    a = np.asarray(a, dtype=np.int64)
+    if a.shape != (N,):
+        raise ValueError(f"Expected a polynomial of shape ({N},), got {a.shape}")
+    return a
+
+def _as_poly_rows(A) -> np.ndarray:
+    """A as a contiguous int64 array, which must hold length-N polynomials as rows."""
+    A = np.ascontiguousarray(A, dtype=np.int64)
+    if A.ndim != 2 or A.shape[1] != N:
+        raise ValueError(f"Expected polynomials of shape (k, {N}), got {A.shape}")
+    return A
+
+def bit_reverse_numpy(a):
+    a = np.asarray(a)
+    if a.shape[0] == N:
+        return a[BITREV_IDX]
+    return a[_bitrev_permutation(a.shape[0])]
+
+def stage_twiddles(root, q, n):
+    """Flat twiddle table: entry m + j is w^j, w = root^(n / 2m), for butterfly j of the half-size-m stage."""
+    tw = np.zeros(n, dtype=np.int64)
     m = 1
-    while m < N:
-        for i in range(0, N, 2*m):
-            w = 1
-            for j in range(m):
-                t = (w * a[i + j + m]) % q
-                u = a[i + j]
-                a[i + j] = (u + t) % q
-                a[i + j + m] = (u - t) % q
-                w = (w * root_of_unity) % q
+    while m < n:
+        w = pow(root, n // (2 * m), q)
+        tw[m:2 * m] = [pow(w, j, q) for j in range(m)]
+        m *= 2
+    return tw
+
+# root_of_unity generates Z_q*, so this is a primitive N-th root; the inverse
+# transform walks the same stages with its inverse
+OMEGA = pow(root_of_unity, (q - 1) // N, q)
+TWIDDLES = stage_twiddles(OMEGA, q, N)
+TWIDDLES_INV = stage_twiddles(pow(OMEGA, -1, q), q, N)
+
+def psi_table_bitrev(psi, q, N):
+    """Powers of a primitive 2N-th root psi in bit-reversed order, for ntt_inplace."""
+    logn = N.bit_length() - 1
+    return np.array([pow(psi, int(format(i, f'0{logn}b')[::-1], 2), q) for i in range(N)], dtype=np.int64)
+
+# Iterative in-place negacyclic NTT (Cooley-Tukey, no bit-reversal pass);
+# output is left in bit-reversed order
+@njit(cache=True)
+def ntt_inplace(a, psi_table, q):
+    n = a.shape[0]
+    mu, sh = _barrett_params(q)
+    # One division per coefficient up front; from here on every value is in
+    # [0, q), so products go through Barrett and sums need one correction
+    for j in range(n):
+        a[j] = a[j] % q
+    t = n
+    m = 1
+    while m < n:
+        t //= 2
+        for i in range(m):
+            j1 = 2 * i * t
+            s = psi_table[m + i] % q
+            for j in range(j1, j1 + t):
+                u = a[j]
+                v = _barrett_mod(a[j + t] * s, q, mu, sh)
+                w = u + v
+                a[j] = w - q if w >= q else w
+                d = u - v
+                a[j + t] = d + q if d < 0 else d
         m *= 2
     return a
 
-@njit(parallel=True, fastmath=True)
-def intt_numba(a, root_of_unity, q, N, challenge_type=0):
-    a = np.array(a, dtype=np.int64)
-    # Bit-reversal
-    n = len(a)
-    result = np.empty_like(a)
-    j = 0
-    for i in range(n):
-        result[j] = a[i]
-        bit = n >> 1
-        while j & bit:
-            j ^= bit
-            bit >>= 1
-        j ^= bit
-    a = result
+# Inverse of ntt_inplace (Gentleman-Sande): takes bit-reversed input, uses
+# bit-reversed powers of psi^-1, and returns coefficients in natural order
+@njit(cache=True)
+def intt_inplace(a, psi_inv_table, n_inv, q):
+    n = a.shape[0]
+    mu, sh = _barrett_params(q)
+    for j in range(n):
+        a[j] = a[j] % q
+    t = 1
+    m = n
+    while m > 1:
+        h = m // 2
+        j1 = 0
+        for i in range(h):
+            s = psi_inv_table[h + i] % q
+            for j in range(j1, j1 + t):
+                u = a[j]
+                v = a[j + t]
+                w = u + v
+                a[j] = w - q if w >= q else w
+                d = u - v
+                if d < 0:
+                    d += q
+                a[j + t] = _barrett_mod(d * s, q, mu, sh)
+            j1 += 2 * t
+        t *= 2
+        m = h
+    n_inv = n_inv % q
+    for j in range(n):
+        a[j] = _barrett_mod(a[j] * n_inv, q, mu, sh)
+    return a
+
+# Shoup precomputation W' = floor(W * 2^32 / q) for the Harvey butterfly; with
+# q < 2^14 every lazy value stays below 4q, so W' * Y fits comfortably in int64
+TWIDDLES_PRECON = (TWIDDLES << 32) // q
+TWIDDLES_INV_PRECON = (TWIDDLES_INV << 32) // q
+
+# Harvey lazy butterflies: values live in [0, 4q) between stages and are only
+# fully reduced once at the end, so the inner loop has no division
+@njit(cache=True)
+def _harvey_stages(a, tw, tw_precon, q):
+    n = a.shape[0]
+    two_q = 2 * q
     m = 1
-    while m < N:
-        for i in range(0, N, 2*m):
-            w = 1
+    while m < n:
+        for i in range(0, n, 2 * m):
             for j in range(m):
-                t = (w * a[i + j + m]) % q
-                u = a[i + j]
-                a[i + j] = (u + t) % q
-                a[i + j + m] = (u - t) % q
-                w = (w * root_of_unity) % q
+                x = a[i + j]
+                if x >= two_q:
+                    x -= two_q
+                y = a[i + j + m]
+                t = tw[m + j] * y - ((tw_precon[m + j] * y) >> 32) * q
+                a[i + j] = x + t
+                a[i + j + m] = x - t + two_q
         m *= 2
-    n_inv = modinv(N, q)
-    a = (a * n_inv) % q
-    # Final reduction based on challenge type
-    if challenge_type == 0:
-        a = np.clip(a, -1, 1)
-    elif challenge_type in [1, 2]:
-        a = np.clip(a, -2, 2)
-    else:
-        a = np.clip(a, -3, 3)
+    for i in range(n):
+        x = a[i]
+        if x >= two_q:
+            x -= two_q
+        if x >= q:
+            x -= q
+        a[i] = x
     return a
 
-# Batch NTT using ThreadPoolExecutor for parallelism
-# Usage: batch_ntt_numba([poly1, poly2, ...], root_of_unity, q, N)
-def batch_ntt_numba(polys, root_of_unity, q, N):
-    with ThreadPoolExecutor() as executor:
-        results = list(executor.map(lambda a: ntt_numba(a, root_of_unity, q, N), polys))
-    return results
-
-def ntt_numpy(a):
-    """Highly optimized, vectorized NTT using numpy."""
-    a = np.array(a, dtype=np.int64)
-    a = bit_reverse_numpy(a)
+# TWIDDLES with each stage's entries in bit-reversed order: entry m + i is
+# root^rev_s(i) for the half-size-m (= 2^s) stage
+def _bitrev_stage_order(tw):
+    out = tw.copy()
     m = 1
-    while m < N:
-        for i in range(0, N, 2*m):
-            w = 1
-            for j in range(m):
-                t = (w * a[i + j + m]) % q
-                u = a[i + j]
-                a[i + j] = (u + t) % q
-                a[i + j + m] = (u - t) % q
-                w = (w * root_of_unity) % q
+    while m < out.shape[0]:
+        out[m:2 * m] = tw[m:2 * m][_bitrev_permutation(m)]
         m *= 2
-    return a.tolist()
+    return out
 
-def intt_numpy(a, challenge_type='00'):
-    """Highly optimized, vectorized inverse NTT using numpy."""
-    a = np.array(a, dtype=np.int64)
-    a = bit_reverse_numpy(a)
+TWIDDLES_BR = _bitrev_stage_order(TWIDDLES)
+TWIDDLES_BR_PRECON = (TWIDDLES_BR << 32) // q
+
+# The stages of _harvey_stages conjugated by the bit-reversal permutation: natural
+# input, bit-reversed output, and no reorder pass (Cooley-Tukey layout)
+@njit(cache=True)
+def _harvey_ct_stages(a, tw, tw_precon, q):
+    n = a.shape[0]
+    two_q = 2 * q
     m = 1
-    while m < N:
-        for i in range(0, N, 2*m):
-            w = 1
+    h = n // 2
+    while m < n:
+        for g in range(m):
+            w = tw[m + g]
+            wp = tw_precon[m + g]
+            base = 2 * h * g
+            for i in range(base, base + h):
+                x = a[i]
+                if x >= two_q:
+                    x -= two_q
+                y = a[i + h]
+                t = w * y - ((wp * y) >> 32) * q
+                a[i] = x + t
+                a[i + h] = x - t + two_q
+        m *= 2
+        h //= 2
+    for i in range(n):
+        x = a[i]
+        if x >= two_q:
+            x -= two_q
+        if x >= q:
+            x -= q
+        a[i] = x
+    return a
+
+def ntt_ct(a) -> np.ndarray:
+    """ntt_array with its output left in bit-reversed order; needs no reorder pass."""
+    return _harvey_ct_stages(_as_poly(a) % q, TWIDDLES_BR, TWIDDLES_BR_PRECON, q)
+
+# intt_gs applied to a pointwise product, with the product formed inside the first
+# butterfly stage and N^-1 folded into the final pass, so neither gets its own array
+@njit(cache=True)
+def _harvey_mul_stages(a, b, tw, tw_precon, q, n_inv):
+    n = a.shape[0]
+    mu, sh = _barrett_params(q)
+    two_q = 2 * q
+    out = np.empty(n, dtype=np.int64)
+    # First stage (m = 1, twiddle tw[1]) reads its operands straight from a * b
+    w = tw[1]
+    wp = tw_precon[1]
+    for i in range(0, n, 2):
+        x = _barrett_mod(a[i] * b[i], q, mu, sh)
+        y = _barrett_mod(a[i + 1] * b[i + 1], q, mu, sh)
+        t = w * y - ((wp * y) >> 32) * q
+        out[i] = x + t
+        out[i + 1] = x - t + two_q
+    m = 2
+    while m < n:
+        for i in range(0, n, 2 * m):
             for j in range(m):
-                t = (w * a[i + j + m]) % q
-                u = a[i + j]
-                a[i + j] = (u + t) % q
-                a[i + j + m] = (u - t) % q
-                w = (w * root_of_unity) % q
+                x = out[i + j]
+                if x >= two_q:
+                    x -= two_q
+                y = out[i + j + m]
+                t = tw[m + j] * y - ((tw_precon[m + j] * y) >> 32) * q
+                out[i + j] = x + t
+                out[i + j + m] = x - t + two_q
         m *= 2
-    n_inv = modinv(N, q)
-    a = (a * n_inv) % q
-    # Final reduction based on challenge type
-    if challenge_type == '00':
-        a = np.clip(a, -1, 1)
-    elif challenge_type in ['01', '10']:
-        a = np.clip(a, -2, 2)
-    else:
-        a = np.clip(a, -3, 3)
-    return a.tolist()
+    for i in range(n):
+        x = out[i]
+        if x >= two_q:
+            x -= two_q
+        if x >= q:
+            x -= q
+        out[i] = _barrett_mod(x * n_inv, q, mu, sh)
+    return out
+
+def intt_of_mul(a, b) -> np.ndarray:
+    """Inverse NTT of a * b mod q for reduced bit-reversed operands (ntt_ct outputs), in one pass.
+
+    The result is left unclipped in [0, q), so callers can still check it against a bound.
+    """
+    a = _as_poly(a)
+    b = _as_poly(b)
+    return _harvey_mul_stages(a, b, TWIDDLES_INV, TWIDDLES_INV_PRECON, q, N_INV)
+
+# Row-parallel intt_of_mul: every row of A against the same b, one thread per row block
+@njit(cache=True, parallel=True)
+def _harvey_mul_batch(A, b, tw, tw_precon, q, n_inv):
+    out = np.empty_like(A)
+    for r in prange(A.shape[0]):
+        out[r] = _harvey_mul_stages(A[r], b, tw, tw_precon, q, n_inv)
+    return out
+
+def intt_of_mul_batch(A, b) -> np.ndarray:
+    """intt_of_mul(A[r], b) for every row of a (B, N) array."""
+    A = _as_poly_rows(A)
+    b = _as_poly(b)
+    return _harvey_mul_batch(A, b, TWIDDLES_INV, TWIDDLES_INV_PRECON, q, N_INV)
+
+def intt_gs(a, challenge_type='00') -> np.ndarray:
+    """intt_array for bit-reversed input (as produced by ntt_ct); needs no reorder pass."""
+    a = _harvey_stages(_as_poly(a) % q, TWIDDLES_INV, TWIDDLES_INV_PRECON, q)
+    return _clip_challenge((a * N_INV) % q, challenge_type)
+
+@njit(cache=True, parallel=True)
+def _harvey_ct_batch(A, tw, tw_precon, q):
+    for r in prange(A.shape[0]):
+        _harvey_ct_stages(A[r], tw, tw_precon, q)
+    return A
+
+def ntt_batch(A) -> np.ndarray:
+    """ntt_ct applied to every row of a (B, N) array, rows transformed in parallel."""
+    A = _as_poly_rows(A) % q
+    return _harvey_ct_batch(A, TWIDDLES_BR, TWIDDLES_BR_PRECON, q)
+
+def ntt_array(a) -> np.ndarray:
+    """Forward NTT returning an int64 array (no list round-trip)."""
+    a = bit_reverse_numpy(_as_poly(a) % q)
+    return _harvey_stages(a, TWIDDLES, TWIDDLES_PRECON, q)
+
+def intt_array(a, challenge_type='00') -> np.ndarray:
+    """Inverse NTT returning an int64 array (no list round-trip)."""
+    a = bit_reverse_numpy(_as_poly(a) % q)
+    a = _harvey_stages(a, TWIDDLES_INV, TWIDDLES_INV_PRECON, q)
+    a = (a * N_INV) % q
+    return _clip_challenge(a, challenge_type)
+
+# Coefficient bound per challenge type; any other type uses 3
+_CHALLENGE_BOUND = {'00': 1, '01': 2, '10': 2}
+
+def _clip_challenge(a, challenge_type):
+    """Final reduction based on challenge type."""
+    # a is fully reduced into [0, q), so only the upper side of the clip can bind
+    return np.minimum(a, _CHALLENGE_BOUND.get(challenge_type, 3))
 
 def fft_numpy(a):
     """Fast Fourier Transform for floating-point polynomials (for analysis only)."""
     return np.fft.fft(a)
 
-def ntt(a: list) -> list:
-    """Forward NTT (compatibility wrapper, uses numpy version)."""
-    return ntt_numpy(a)
+def ntt(a: np.ndarray) -> np.ndarray:
+    """Forward NTT (compatibility wrapper, uses the compiled version)."""
+    return ntt_array(a)
 
-def intt(a: list, challenge_type: str = '00') -> list:
-    """Inverse NTT (compatibility wrapper, uses numpy version)."""
-    return intt_numpy(a, challenge_type)
+def intt(a: np.ndarray, challenge_type: str = '00') -> np.ndarray:
+    """Inverse NTT (compatibility wrapper, uses the compiled version)."""
+    return intt_array(a, challenge_type)
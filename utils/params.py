@@ -1,13 +1,43 @@
 # utils/params.py
 
+import numpy as np
+from dataclasses import dataclass
+
 N = 512  # Polynomial degree
 q = 12289  # Prime modulus for NTT (same as Falcon)
 
 # Primitive root of unity for NTT
 root_of_unity = 11
 
+# N^-1 mod q, applied at the end of every inverse NTT
+N_INV = pow(N, -1, q)
+
+# Storage type for length-N coefficient vectors (keys, signatures): values mod q
+# fit in int16 while q < 2^15; kernels widen to int64 only around products
+COEFF_DTYPE = np.int16 if q.bit_length() <= 15 else np.int32 if q.bit_length() <= 31 else np.int64
+
 # NTT requires powers of unity modulo q
 modulus_poly = [1] + [0] * (N - 1) + [1]  # X^N + 1
 
 # Gaussian sampler std dev
 GAUSSIAN_STDDEV = 1.2
+
+# Scalar form of np.allclose(lhs, 1.0): default atol 1e-6 plus rtol 1e-5 * |1|,
+# used wherever a point is checked against a unit hyperbola equation
+HYPERBOLA_TOL = 1e-6 + 1e-5
+
+@dataclass(frozen=True, slots=True)
+class SecurityConstants:
+    """Security thresholds derived from the parameters above, computed once at import."""
+    entropy_threshold: int      # 2^min_entropy (128 bits)
+    grover_threshold: int       # Grover's algorithm resistance
+    shor_threshold: int         # Shor's algorithm resistance
+    min_quantum_modulus: int    # Minimum modulus size for quantum resistance
+    shake_bytes: int = 64       # SHAKE256 oracle output (512 bits)
+
+SC = SecurityConstants(
+    entropy_threshold=1 << 128,
+    grover_threshold=1 << (N // 2),
+    shor_threshold=1 << (N // 3),
+    min_quantum_modulus=1 << 2048,
+)
@@ -0,0 +1,55 @@
+# utils/test_miller_rabin.py
+
+import random
+import numpy as np
+import pytest
+from utils.miller_rabin import is_prime_u64
+
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+def _reference_is_prime(n):
+    """Trial division for small n, Miller-Rabin on the first twelve primes otherwise (exact below 3.3e24)."""
+    if n < 2:
+        return False
+    if n < 1 << 20:
+        return all(n % p for p in range(2, int(n ** 0.5) + 1))
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in SMALL_PRIMES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _in_domain(n):
+    # is_prime_u64 expects odd n > 37 with no prime factor <= 37
+    return n > 37 and all(n % p for p in SMALL_PRIMES)
+
+def _check(candidates):
+    for n in filter(_in_domain, candidates):
+        assert bool(is_prime_u64(np.uint64(n))) == _reference_is_prime(n), n
+
+def test_small_range_matches_trial_division():
+    _check(range(39, 20000))
+
+def test_near_2_64_matches_reference():
+    _check(range(2**64 - 5000, 2**64))
+    assert is_prime_u64(np.uint64(2**64 - 59))
+
+def test_random_u64_matches_reference():
+    rng = random.Random(12289)
+    _check(rng.getrandbits(64) | 1 for _ in range(5000))
+
+@pytest.mark.parametrize("n", [3215031751, 3825123056546413051])
+def test_strong_pseudoprimes_are_composite(n):
+    assert _in_domain(n)
+    assert not _reference_is_prime(n)
+    assert not is_prime_u64(np.uint64(n))
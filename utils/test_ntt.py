@@ -0,0 +1,95 @@
+# utils/test_ntt.py
+
+import numpy as np
+import pytest
+from utils.ntt import (BITREV_IDX, OMEGA, intt, intt_gs, intt_of_mul, intt_of_mul_batch,
+                       ntt, ntt_batch, ntt_ct)
+from utils.params import N, q
+from verification.verify import verify_proof, verify_proof_batch, _message_hash
+
+CHALLENGES = ['00', '01', '10', '11']
+BOUND = {'00': 1, '01': 2, '10': 2, '11': 3}
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(12289)
+
+def test_ntt_is_the_dft_over_omega(rng):
+    x = rng.integers(0, q, N)
+    powers = np.array([[pow(OMEGA, i * j, q) for j in range(N)] for i in range(N)], dtype=np.int64)
+    assert np.array_equal(ntt(x), (powers @ x) % q)
+
+def test_ntt_ct_is_bit_reversed_ntt(rng):
+    x = rng.integers(0, q, N)
+    assert np.array_equal(ntt_ct(x), ntt(x)[BITREV_IDX])
+
+@pytest.mark.parametrize("challenge_type", CHALLENGES)
+def test_intt_gs_inverts_ntt_ct(rng, challenge_type):
+    # Coefficients within the challenge bound survive the final clip unchanged
+    x = rng.integers(0, BOUND[challenge_type] + 1, N)
+    assert np.array_equal(intt_gs(ntt_ct(x), challenge_type), x)
+    assert np.array_equal(intt(ntt(x), challenge_type), x)
+
+@pytest.mark.parametrize("challenge_type", CHALLENGES)
+def test_intt_of_mul_matches_unfused(rng, challenge_type):
+    a = rng.integers(0, q, N)
+    b = rng.integers(0, q, N)
+    expected = intt((ntt(a) * ntt(b)) % q, challenge_type)
+    # intt_of_mul leaves the clip to the caller
+    got = np.minimum(intt_of_mul(ntt_ct(a), ntt_ct(b)), BOUND[challenge_type])
+    assert np.array_equal(got, expected)
+
+def test_intt_of_mul_is_cyclic_convolution(rng):
+    a = rng.integers(0, 4, N)
+    b = rng.integers(0, 4, N)
+    # Cyclic product mod (X^N - 1, q), computed one index at a time
+    conv = np.array([sum(int(a[i]) * int(b[(k - i) % N]) for i in range(N)) % q for k in range(N)])
+    assert np.array_equal(intt_of_mul(ntt_ct(a), ntt_ct(b)), conv)
+
+def test_intt_of_mul_batch_matches_rows(rng):
+    A = rng.integers(0, q, (6, N))
+    b = ntt_ct(rng.integers(0, q, N))
+    out = intt_of_mul_batch(ntt_batch(A), b)
+    for row, got in zip(A, out):
+        assert np.array_equal(got, intt_of_mul(ntt_ct(row), b))
+
+def test_verify_proof_batch_agrees_with_verify_proof(rng):
+    messages = [f"message {i}".encode() for i in range(8)]
+    public_key = {'h_pub': rng.integers(-1, 2, N), 'params': {'N': N, 'q': q}}
+    signatures = []
+    for i, message in enumerate(messages):
+        # '00' and '11' need no hyperbola fields
+        ct = '00' if i % 2 == 0 else '11'
+        signatures.append({'challenge_type': ct, 's': rng.integers(-1, 2, N),
+                           'message_hash': _message_hash(message)})
+    # A short s, a wrong hash and a tiny s that passes the bound
+    signatures[1]['s'] = signatures[1]['s'][:-1]
+    signatures[2]['message_hash'] = 'bad'
+    signatures[3]['s'] = np.zeros(N, dtype=np.int64)
+    expected = [verify_proof(m, s, public_key) for m, s in zip(messages, signatures)]
+    assert list(verify_proof_batch(messages, signatures, public_key)) == expected
+    assert expected[3] and not expected[1] and not expected[2]
+
+def test_verify_proof_rejects_out_of_bound_product():
+    message = b"bound"
+    signature = {'challenge_type': '11', 'message_hash': _message_hash(message)}
+    # s = 1 times h = -1: every coefficient is q - 1, i.e. -1, within the bound
+    signature['s'] = np.eye(1, N, dtype=np.int64)[0]
+    assert verify_proof(message, signature, {'h_pub': -np.ones(N, dtype=np.int64)})
+    # All-ones times all-ones: every coefficient is N, far over the bound
+    signature['s'] = np.ones(N, dtype=np.int64)
+    public_key = {'h_pub': np.ones(N, dtype=np.int64)}
+    assert not verify_proof(message, signature, public_key)
+    assert not verify_proof_batch([message], [signature], public_key)[0]
+
+def test_wrong_lengths_raise(rng):
+    short = rng.integers(0, q, 300)
+    good = rng.integers(0, q, N)
+    for call in (lambda: ntt(short), lambda: intt(short), lambda: ntt_ct(short),
+                 lambda: intt_gs(short),
+                 lambda: intt_of_mul(short, good), lambda: intt_of_mul(good, short),
+                 lambda: ntt_batch(short), lambda: ntt_batch(short.reshape(3, 100)),
+                 lambda: intt_of_mul_batch(short.reshape(3, 100), good),
+                 lambda: intt_of_mul_batch(good.reshape(1, N), short)):
+        with pytest.raises(ValueError):
+            call()
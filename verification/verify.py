@@ -1,22 +1,20 @@
 # verification/verify.py
-from decimal import Decimal, getcontext
 import numpy as np
-import time
-from utils.ntt import ntt, intt
-from utils.params import N, q
-from hash.sha_utils import shake256_hash
-import matplotlib.pyplot as plt
-from typing import Dict, Any
+from utils.ntt import ntt_ct, ntt_batch, intt_of_mul, intt_of_mul_batch
+from utils.params import N, q, HYPERBOLA_TOL
+from hash.sha_utils import commitment_digest
+from typing import Dict, Any, List, Optional, Tuple, Union
+from dataclasses import dataclass, fields
+from numba import njit
 import hashlib
-import random
-import sys
+import hmac
 import math
-from security.lattice_security import LatticeSecurity
-from security.fiat_shamir_security import FiatShamirSecurity
 from challenge.four_challenges import verify_response
 
 def plot_hyperbola(a, b, challenge_type, private_point, public_point, save_path=None):
     """Plot hyperbola and intersection points."""
+    # Imported here so verification-only callers never load pyplot
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 8))
     
     # Generate points for hyperbola
@@ -61,97 +59,153 @@ def plot_hyperbola(a, b, challenge_type, private_point, public_point, save_path=
     else:
         plt.show()
 
-def verify_hyperbola_graph(commitment, challenge_type, private_point, public_point):
-    """Verify hyperbola graph matches between prover and verifier."""
+# Challenge -> (index of the a² coordinate, index of the b² coordinate, orientation):
+# horizontal x²/a² - y²/b² = 1, vertical y²/a² - x²/b² = 1
+_HYPERBOLA_AXES = {'01': (0, 1, 'horizontal'), '10': (1, 0, 'vertical')}
+
+def verify_hyperbola_graph(commitment, challenge_type, private_point, public_point, verbose=False):
+    """Verify hyperbola graph matches between prover and verifier; step output only when verbose."""
     try:
-        print("\nStep 4: Hyperbola Graph Verification")
+        if verbose:
+            print("\nStep 4: Hyperbola Graph Verification")
         
         # Extract hyperbola parameters
         if 'a' not in commitment or 'b' not in commitment:
-            print("Status: ❌ FAILED - Hyperbola parameters not found in commitment")
+            if verbose:
+                print("Status: ❌ FAILED - Hyperbola parameters not found in commitment")
             return False
             
         a = commitment['a']
         b = commitment['b']
         
-        print(f"Hyperbola parameters: a={a}, b={b}")
+        if verbose:
+            print(f"Hyperbola parameters: a={a}, b={b}")
+        inv_a2 = 1.0 / (a * a)
+        inv_b2 = 1.0 / (b * b)
         
-        # Verify points lie on the hyperbola
-        if challenge_type == '01':
-            # For horizontal hyperbola: x²/a² - y²/b² = 1
-            lhs_private = private_point[0]**2 / a**2 - private_point[1]**2 / b**2
-            lhs_public = public_point[0]**2 / a**2 - public_point[1]**2 / b**2
+        # Verify points lie on the hyperbola (one shared check, axes picked per challenge)
+        if challenge_type in _HYPERBOLA_AXES:
+            u, v, orientation = _HYPERBOLA_AXES[challenge_type]
+            lhs_private = private_point[u]**2 * inv_a2 - private_point[v]**2 * inv_b2
+            lhs_public = public_point[u]**2 * inv_a2 - public_point[v]**2 * inv_b2
             
-            print(f"Private point equation: {lhs_private}")
-            print(f"Public point equation: {lhs_public}")
+            if verbose:
+                print(f"Private point equation: {lhs_private}")
+                print(f"Public point equation: {lhs_public}")
             
-            if not (np.allclose(lhs_private, 1.0, atol=1e-6) and 
-                    np.allclose(lhs_public, 1.0, atol=1e-6)):
-                print("Status: ❌ FAILED - Points do not lie on horizontal hyperbola")
-                return False
-
-        elif challenge_type == '10':
-            # For vertical hyperbola: y²/a² - x²/b² = 1
-            lhs_private = private_point[1]**2 / a**2 - private_point[0]**2 / b**2
-            lhs_public = public_point[1]**2 / a**2 - public_point[0]**2 / b**2
-            
-            print(f"Private point equation: {lhs_private}")
-            print(f"Public point equation: {lhs_public}")
-            
-            if not (np.allclose(lhs_private, 1.0, atol=1e-6) and 
-                    np.allclose(lhs_public, 1.0, atol=1e-6)):
-                print("Status: ❌ FAILED - Points do not lie on vertical hyperbola")
+            if not (abs(lhs_private - 1.0) <= HYPERBOLA_TOL and abs(lhs_public - 1.0) <= HYPERBOLA_TOL):
+                if verbose:
+                    print(f"Status: ❌ FAILED - Points do not lie on {orientation} hyperbola")
                 return False
                 
-        print("Status: ✓ PASSED - Hyperbola graph verification successful")
+        if verbose:
+            print("Status: ✓ PASSED - Hyperbola graph verification successful")
         return True
         
     except Exception as e:
         print(f"Status: ❌ FAILED - Graph verification error: {e}")
         return False
 
+@njit(cache=True)
+def _max_abs_le(a, k, q):
+    """True if every a[i], read centred mod q, has |a[i]| <= k; stops at the first one over the bound."""
+    half = q // 2
+    for i in range(a.shape[0]):
+        c = a[i]
+        if c > half:
+            c -= q
+        if abs(c) > k:
+            return False
+    return True
+
+def _message_hash(message: bytes) -> str:
+    """SHA-256 hex of a message, shared by verify_signature and verify_proof."""
+    return hashlib.sha256(message).hexdigest()
+
+def _hash_matches(message: bytes, message_hash) -> bool:
+    """Constant-time compare of a signature's hex message_hash with the SHA-256 of message."""
+    # compare_digest only takes ASCII str; anything else cannot be a hex digest
+    if not isinstance(message_hash, str) or not message_hash.isascii():
+        return False
+    return hmac.compare_digest(_message_hash(message), message_hash)
+
 class VerificationError(Exception):
     """Custom exception for verification errors."""
     pass
 
-def verify_signature(message: bytes, signature: dict, public_key: dict) -> bool:
+@dataclass(frozen=True, slots=True)
+class SigView:
+    """Signature fields read out of the signature dict once; absent fields are None."""
+    challenge_type: Optional[str] = None
+    message_hash: Optional[str] = None
+    commitment: Any = None
+    response: Optional[dict] = None
+    s: Any = None
+    x: Any = None
+    y: Any = None
+    a: Any = None
+    b: Any = None
+    intersection_point: Any = None
+
+    @classmethod
+    def from_dict(cls, signature: Dict[str, Any]) -> 'SigView':
+        return cls(**{name: signature.get(name) for name in _SIGVIEW_FIELDS})
+
+_SIGVIEW_FIELDS = tuple(f.name for f in fields(SigView))
+
+def _check_signature(message: bytes, signature: dict, public_key: dict) -> Tuple[bool, str]:
+    """Core of verify_signature without output: (valid, status line to report)."""
+    if not isinstance(message, bytes) or not isinstance(signature, dict) or not isinstance(public_key, dict):
+        return False, "❌ Input validation failed"
+    sv = SigView.from_dict(signature)
+    if not all([sv.challenge_type, sv.message_hash, sv.commitment, sv.response]):
+        return False, "❌ Missing required signature components"
+    if not _hash_matches(message, sv.message_hash):
+        return False, "❌ Message hash verification failed"
+    n = public_key['params']['q']
+    public_params = {'n': n}
+    if 'v' in public_key:
+        public_params['v'] = public_key['v']
+    # Use verify_response for the actual check
+    if verify_response(sv.challenge_type, sv.commitment, sv.response, public_params):
+        return True, "✅ Signature verification passed"
+    return False, "❌ Signature verification failed"
+
+def verify_signature(message: bytes, signature: dict, public_key: dict, verbose: bool = False) -> bool:
     """Verify a signature using efficient, vectorized modular arithmetic and minimal checks."""
     try:
-        if not isinstance(message, bytes) or not isinstance(signature, dict) or not isinstance(public_key, dict):
-            print("❌ Input validation failed")
-            return False
-        challenge_type = signature.get('challenge_type')
-        message_hash = signature.get('message_hash')
-        commitment = signature.get('commitment')
-        response = signature.get('response')
-        if not all([challenge_type, message_hash, commitment, response]):
-            print("❌ Missing required signature components")
-            return False
-        computed_hash = hashlib.sha256(message).hexdigest()
-        if computed_hash != message_hash:
-            print("❌ Message hash verification failed")
-            return False
-        n = public_key['params']['q']
-        public_params = {'n': n}
-        if 'v' in public_key:
-            public_params['v'] = public_key['v']
-        # Use verify_response for the actual check
-        valid = verify_response(challenge_type, commitment, response, public_params)
-        if valid:
-            print("✅ Signature verification passed")
-        else:
-            print("❌ Signature verification failed")
+        valid, status = _check_signature(message, signature, public_key)
+        # The status line is only formatted and written when asked for
+        if verbose:
+            print(status)
         return valid
     except Exception as e:
-        print(f"❌ Verification error: {str(e)}")
+        if verbose:
+            print(f"❌ Verification error: {str(e)}")
         return False
 
+def verify_signatures(messages: List[bytes], signatures: List[dict],
+                      public_keys: Union[dict, List[dict]]) -> np.ndarray:
+    """Verify a batch of signatures; returns one bool per signature and prints nothing per item."""
+    if isinstance(public_keys, dict):
+        public_keys = [public_keys] * len(signatures)
+    results = np.zeros(len(signatures), dtype=bool)
+    # Mismatched lengths reject the whole batch
+    if not len(messages) == len(signatures) == len(public_keys):
+        return results
+    # Every item is checked and written out; a failure never stops the batch
+    for i, (message, signature, public_key) in enumerate(zip(messages, signatures, public_keys)):
+        try:
+            results[i] = _check_signature(message, signature, public_key)[0]
+        except Exception:
+            results[i] = False
+    return results
+
 def verify_commitment(s: list, commitment: dict, x: int, y: int, h: int, k: int, a: int, b: int) -> bool:
     """Verify the commitment matches the provided values."""
     try:
         # Recompute commitment hash
-        data = f"{s}|{commitment.get('extra_randomness', [])}|{x}|{y}|{h}|{k}".encode()
-        computed_hash = hashlib.sha256(data).hexdigest()
+        computed_hash = commitment_digest(s, commitment.get('extra_randomness', []), x, y, h, k)
         
         # Verify hash matches
         if computed_hash != commitment.get('commitment'):
@@ -170,82 +224,154 @@ def verify_commitment(s: list, commitment: dict, x: int, y: int, h: int, k: int,
     except Exception:
         return False
 
+def _no_extra_fields(sv: SigView) -> bool:
+    """Challenges 00 and 11 carry nothing beyond s and the message hash."""
+    return True
+
+def _has_hyperbola_fields(sv: SigView) -> bool:
+    """Challenges 01 and 10 must carry the hyperbola point, commitment and intersection."""
+    return not (sv.x is None or sv.y is None or sv.commitment is None
+                or sv.intersection_point is None)
+
+def _on_horizontal_hyperbola(sv: SigView) -> bool:
+    """Challenge 01: the hyperbola fields, and (x, y) on x²/a² - y²/b² = 1."""
+    if not _has_hyperbola_fields(sv):
+        return False
+    x, y = sv.x, sv.y
+    a = 1 if sv.a is None else sv.a
+    b = 1 if sv.b is None else sv.b
+    lhs = x**2 * (1.0 / a**2) - y**2 * (1.0 / b**2)
+    # Scalar points take the plain compare (same tolerance as np.allclose);
+    # np.allclose is kept for array-valued x, y
+    if isinstance(lhs, float):
+        return abs(lhs - 1.0) <= HYPERBOLA_TOL
+    return bool(np.allclose(lhs, 1.0, atol=1e-6))
+
+# Challenge type -> (structural check, coefficient bound); any other type is
+# checked like '11'
+_PROOF_RULES = {
+    '00': (_no_extra_fields, 1),
+    '01': (_on_horizontal_hyperbola, 2),
+    '10': (_has_hyperbola_fields, 2),
+    '11': (_no_extra_fields, 3),
+}
+
+def _proof_rule(challenge_type):
+    """(structural check, coefficient bound) for a challenge type."""
+    return _PROOF_RULES.get(challenge_type, _PROOF_RULES['11'])
+
+def _proof_precheck(message: bytes, signature: Dict[str, Any], public_key: Dict[str, Any]) -> Optional[SigView]:
+    """Every verify_proof check that runs before the NTT: the SigView if all pass, else None."""
+    # Step 1: Input Validation
+    if not isinstance(message, bytes):
+        return None
+    if not isinstance(signature, dict):
+        return None
+    if not isinstance(public_key, dict):
+        return None
+    
+    # Step 2: Signature Component Extraction (one pass over the dict)
+    sv = SigView.from_dict(signature)
+    if sv.s is None or sv.challenge_type is None or sv.message_hash is None:
+        return None
+    
+    # Step 3: Public Key Validation
+    if 'h_pub' not in public_key:
+        return None
+    
+    # Challenge-specific checks, picked once from the rules table; they are all
+    # scalar work, so they run before the message is hashed
+    check, _ = _proof_rule(sv.challenge_type)
+    if not check(sv):
+        return None
+    
+    # Step 4: Message Hash Verification (before the NTT, so a bad signature is
+    # rejected before any O(N) work)
+    if not _hash_matches(message, sv.message_hash):
+        return None
+    
+    return sv
+
 def verify_proof(message: bytes, signature: Dict[str, Any], public_key: Dict[str, Any]) -> bool:
     """Verify a signature proof using the public key."""
     try:
-        # Step 1: Input Validation
-        if not isinstance(message, bytes):
-            return False
-        if not isinstance(signature, dict):
-            return False
-        if not isinstance(public_key, dict):
+        sv = _proof_precheck(message, signature, public_key)
+        if sv is None:
             return False
+        challenge_type = sv.challenge_type
         
-        # Step 2: Signature Component Extraction
-        if 's' not in signature or 'challenge_type' not in signature or 'message_hash' not in signature:
+        # Convert once; everything below works on these int64 arrays
+        s = np.asarray(sv.s, dtype=np.int64)
+        h = np.asarray(public_key['h_pub'], dtype=np.int64)
+        # The compiled kernels index without bounds checks, so only length-N
+        # polynomials may reach them
+        if s.shape != (N,) or h.shape != (N,):
             return False
-        s = signature['s']
-        challenge_type = signature['challenge_type']
-        message_hash = signature['message_hash']
         
-        # Step 3: Public Key Validation
-        if 'h_pub' not in public_key:
-            return False
-        h = public_key['h_pub']
+        # Step 10: NTT Transform (bit-reversed order; the pointwise product does
+        # not care, and intt_of_mul takes that order directly, so no reorder passes)
+        s_ntt = ntt_ct(s)
+        h_ntt = ntt_ct(h)
         
-        # Step 4: Message Hash Verification
-        computed_hash = hashlib.sha256(message).hexdigest()
-        if computed_hash != message_hash:
-            return False
-        
-        # Hyperbola-specific verification steps
-        if challenge_type in ['01', '10']:
-            if 'x' not in signature:
-                return False
-            x = signature['x']
-            
-            if 'y' not in signature:
-                return False
-            y = signature['y']
-            
-            if challenge_type == '01':
-                a = signature.get('a', 1)
-                b = signature.get('b', 1)
-                lhs = (x**2 / a**2) - (y**2 / b**2)
-                if not np.allclose(lhs, 1.0, atol=1e-6):
-                    return False
-            
-            if 'commitment' not in signature:
-                return False
-            commitment = signature['commitment']
-            
-            if 'intersection_point' not in signature:
-                return False
-        
-        # Step 10: NTT Transform
-        s_ntt = ntt(s)
-        h_ntt = ntt(h)
-        
-        # Step 11: Polynomial Multiplication
-        product = [(s_ntt[i] * h_ntt[i]) % q for i in range(N)]
-        
-        # Step 12: Inverse NTT
-        result = intt(product, challenge_type)
+        # Steps 11-12: Polynomial Multiplication and Inverse NTT, fused so the
+        # pointwise product is formed inside the first inverse butterfly stage;
+        # the product is not clipped, so the bound check below can fail
+        result = intt_of_mul(s_ntt, h_ntt)
         
         # Step 13: Coefficient Verification
-        if challenge_type == '00':
-            is_valid = all(abs(x) <= 1 for x in result)
-        elif challenge_type in ['01', '10']:
-            is_valid = all(abs(x) <= 2 for x in result)
-        else:  # challenge_type == '11'
-            is_valid = all(abs(x) <= 3 for x in result)
+        _, bound = _proof_rule(challenge_type)
+        is_valid = bool(_max_abs_le(result, bound, q))
         
         return is_valid
         
     except Exception:
         return False
 
-if __name__ == "__main__":
+def verify_proof_batch(messages: List[bytes], signatures: List[Dict[str, Any]],
+                       public_key: Dict[str, Any]) -> np.ndarray:
+    """verify_proof for many signatures under one key; returns one bool per signature."""
+    results = np.zeros(len(signatures), dtype=bool)
+    # Mismatched lengths reject the whole batch
+    if len(messages) != len(signatures):
+        return results
+    try:
+        # The key is transformed once for the whole batch
+        h = np.asarray(public_key['h_pub'], dtype=np.int64)
+        if h.shape != (N,):
+            return results
+        h_ntt = ntt_ct(h)
+    except Exception:
+        return results
+    
+    # Per-signature checks stay scalar; survivors go through the NTT pipeline together
+    idx, rows, challenge_types = [], [], []
+    for i, (message, signature) in enumerate(zip(messages, signatures)):
+        try:
+            sv = _proof_precheck(message, signature, public_key)
+            if sv is None:
+                continue
+            s = np.asarray(sv.s, dtype=np.int64)
+        except Exception:
+            continue
+        if s.shape != h_ntt.shape:
+            continue
+        idx.append(i)
+        rows.append(s)
+        challenge_types.append(sv.challenge_type)
+    if not idx:
+        return results
+    
+    result = intt_of_mul_batch(ntt_batch(np.stack(rows)), h_ntt)
+    # Same centred-mod-q reading as _max_abs_le
+    result = np.where(result > q // 2, result - q, result)
+    bounds = np.array([_proof_rule(ct)[1] for ct in challenge_types])
+    results[idx] = np.abs(result).max(axis=1) <= bounds
+    return results
+
+def _demo():
+    """Sign and verify one message; only run when this file is executed directly."""
+    import random
+    import sys
     try:
         # Example usage
         message = b"Test message"
@@ -272,7 +398,10 @@ if __name__ == "__main__":
         signature = signature_result['signature']
         
         # Verify the signature
-        result = verify_signature(message, signature, public_key)
+        result = verify_signature(message, signature, public_key, verbose=True)
         
     except Exception:
         sys.exit(1)
+
+if __name__ == "__main__":
+    _demo()
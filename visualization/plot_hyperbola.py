@@ -1,32 +1,32 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
 
 def plot_hyperbola(a, b, challenge_type, ax=None):
     """Plot hyperbola based on challenge type and parameters."""
+    from matplotlib.collections import LineCollection
     if ax is None:
+        import matplotlib.pyplot as plt
         ax = plt.gca()
     
-    # Generate points
-    x = np.linspace(-10, 10, 1000)
+    # Generate points; the same grid serves as x (horizontal) or y (vertical)
+    u = np.linspace(-10, 10, 1000)
+    t = u * u * (1.0 / (a * a)) - 1.0
+    # Only the part of the grid where the curve exists goes through sqrt,
+    # once; the other branch is its negation
+    mask = t > 0
+    u = u[mask]
+    w = b * np.sqrt(t[mask])
+    # One segment per arm, so the two sides of the gap are not joined
+    arms = [(u[s], sign * w[s]) for s in (u < 0, u > 0) for sign in (1, -1)]
     
     if challenge_type in ['01', '10']:
         # Horizontal hyperbola: (x^2/a^2) - (y^2/b^2) = 1
-        y_pos = b * np.sqrt((x**2/a**2) - 1)
-        y_neg = -b * np.sqrt((x**2/a**2) - 1)
-        # Plot only where x^2/a^2 > 1
-        mask = x**2/a**2 > 1
-        ax.plot(x[mask], y_pos[mask], 'b-', label=f'Challenge {challenge_type}')
-        ax.plot(x[mask], y_neg[mask], 'b-')
+        segs, color = [np.column_stack((p, r)) for p, r in arms], 'b'
     else:  # '00' or '11'
         # Vertical hyperbola: (y^2/a^2) - (x^2/b^2) = 1
-        y = np.linspace(-10, 10, 1000)
-        x_pos = b * np.sqrt((y**2/a**2) - 1)
-        x_neg = -b * np.sqrt((y**2/a**2) - 1)
-        # Plot only where y^2/a^2 > 1
-        mask = y**2/a**2 > 1
-        ax.plot(x_pos[mask], y[mask], 'r-', label=f'Challenge {challenge_type}')
-        ax.plot(x_neg[mask], y[mask], 'r-')
+        segs, color = [np.column_stack((r, p)) for p, r in arms], 'r'
+    # All four arms as a single artist instead of one Line2D per branch
+    ax.add_collection(LineCollection(segs, colors=color, label=f'Challenge {challenge_type}'))
+    ax.autoscale_view()
 
     # Add grid and labels
     ax.grid(True)
@@ -37,6 +37,8 @@ def plot_hyperbola(a, b, challenge_type, ax=None):
     ax.axis('equal')
 
 def main():
+    # pyplot is only needed to render, so importing this module stays cheap
+    import matplotlib.pyplot as plt
     # Create a figure with 2x2 subplots
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 15))
     